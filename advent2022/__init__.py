@@ -0,0 +1,26 @@
+"""
+runs the advent of code 2022 puzzles from one place.
+
+the days that use this package import it as `advent2022`, so they have to be run from the repo root
+as modules (`python -m day14.p14 day14/input.txt`), or through the runner (`python -m advent2022 run 14 --input day14/input.txt`)
+"""
+
+# day number -> module with the parse/part1/part2 entry points for that day
+DAY_MODULES = {
+    1: "day01.puzzle01",
+    2: "day02.puzzle02",
+    3: "day03.puzzle03",
+    4: "day04.puzzle04",
+    5: "day05.puzzle05",
+    6: "day06.puzzle06",
+    7: "day07.puzzle07",
+    8: "day08.puzzle08",
+    9: "day09.puzzle09",
+    10: "day10.puzzle10",
+    11: "day11.puzzle11",
+    12: "day12.p12",
+    13: "day13.p13",
+    14: "day14.p14",
+    15: "day15.p15",
+    16: "day16.p16",
+}
@@ -0,0 +1,53 @@
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+
+from advent2022 import DAY_MODULES, profiling
+from advent2022.runner import format_json, format_text, run_day
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m advent2022")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run = subparsers.add_parser("run", help="solve a day, timing parse and each part")
+    run.add_argument("day", type=int, help="day to run")
+    run.add_argument("part", type=int, nargs='?', choices=(1, 2), help="only run this part (default: both)")
+    run.add_argument("--input", required=True, help="puzzle input file")
+    run.add_argument("--json", action="store_true", help="print timings as json")
+    run.add_argument("-v", "--verbose", action="store_true", help="also show whatever the solvers print")
+    run.add_argument("--profile", action="store_true",
+                     help="run under cProfile with the solver counters on, and dump the stats to the profile dir")
+    run.add_argument("--profile-dir", default=".", help="where to write dayNN.prof (default: current directory)")
+    return parser
+
+def print_profile(day: int, profiler: cProfile.Profile, directory: str, limit: int = 25):
+    """saves the raw pstats for a day, and prints the top of it"""
+    path = os.path.join(directory, f"day{day:02}.prof")
+    profiler.dump_stats(path)
+    print(f"profile written to {path}", file=sys.stderr)
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+
+def main(argv=None) -> int:
+    parser = make_parser()
+    matches = parser.parse_args(argv)
+    if matches.day not in DAY_MODULES:
+        parser.error(f"no puzzle for day {matches.day}, expected one of {min(DAY_MODULES)}..{max(DAY_MODULES)}")
+    parts = (matches.part,) if matches.part else (1, 2)
+    profiler = None
+    if matches.profile:
+        # has to happen before the day is imported, that's when its hooks are set up
+        profiling.enable()
+        profiler = cProfile.Profile()
+    result = run_day(matches.day, matches.input, parts, profiler=profiler)
+    print(format_json(result) if matches.json else format_text(result, verbose=matches.verbose))
+    if profiler is not None:
+        print_profile(matches.day, profiler, matches.profile_dir)
+    # the hooks can also be switched on from the environment, without cProfile
+    if profiling.enabled() and (report := profiling.report()):
+        print(report, file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""synthetic puzzle inputs and a scaling benchmark for every day's solver"""
+
+from advent2022.bench.generators import GENERATORS, Generator, generate
@@ -0,0 +1,31 @@
+import argparse
+
+from advent2022.bench.generators import GENERATORS
+from advent2022.bench.scaling import format_json, format_text, run_scaling
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m advent2022.bench",
+                                     description="times every day's solver on generated inputs of growing size")
+    parser.add_argument("days", type=int, nargs='*', help="days to benchmark (default: all of them)")
+    parser.add_argument("--sizes", type=lambda s: [int(n) for n in s.split(',')],
+                        help="comma separated sizes to generate, instead of each day's defaults")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generators")
+    parser.add_argument("--repeat", type=int, default=1, help="run each size this many times and keep the fastest")
+    parser.add_argument("--json", action="store_true", help="print the results as json")
+    return parser
+
+if __name__ == '__main__':
+    parser = make_parser()
+    matches = parser.parse_args()
+    days = matches.days or sorted(GENERATORS)
+    if unknown := [d for d in days if d not in GENERATORS]:
+        parser.error(f"no generator for day(s) {unknown}")
+    results = []
+    for day in days:
+        result = run_scaling(day, matches.sizes, seed=matches.seed, repeat=matches.repeat)
+        results.append(result)
+        if not matches.json:
+            print(format_text(result), flush=True)
+    if matches.json:
+        print(format_json(results))
@@ -0,0 +1,267 @@
+"""
+seeded generators for puzzle inputs of any size.
+
+every generator takes a `random.Random` and a size, and returns the text of an input file.
+what `size` counts is different for each day (elves, lines, grid width...), see the docstrings
+"""
+from dataclasses import dataclass
+import itertools
+import json
+import math
+import random
+import string
+from typing import Callable
+
+
+def calorie_lists(rng: random.Random, size: int) -> str:
+    """`size` elves, each carrying a handful of snacks"""
+    elves = ('\n'.join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 8))) for _ in range(size))
+    return '\n\n'.join(elves) + '\n'
+
+def rps_guides(rng: random.Random, size: int) -> str:
+    """`size` rounds of rock paper scissors"""
+    return ''.join(f"{rng.choice('ABC')} {rng.choice('XYZ')}\n" for _ in range(size))
+
+def rucksacks(rng: random.Random, size: int) -> str:
+    """`size` groups of three elves. each rucksack has one item in both halves, each group one shared badge"""
+    letters = string.ascii_letters
+    lines = []
+    for _ in range(size):
+        badge = rng.choice(letters)
+        rest = [ch for ch in letters if ch != badge]
+        rng.shuffle(rest)
+        # each elf gets their own letters, so the badge is the only thing all three have in common
+        for own in (rest[0:17], rest[17:34], rest[34:51]):
+            pool = own + [badge]
+            shared = rng.choice(pool)
+            pool.remove(shared)
+            rng.shuffle(pool)
+            (left_pool, right_pool) = (pool[:len(pool)//2], pool[len(pool)//2:])
+            half = rng.randint(4, 16)
+            left = [shared] + rng.choices(left_pool, k=half-1)
+            right = [shared] + rng.choices(right_pool, k=half-1)
+            if badge in left_pool:
+                left[-1] = badge
+            elif badge in right_pool:
+                right[-1] = badge
+            rng.shuffle(left)
+            rng.shuffle(right)
+            lines.append(''.join(left + right))
+    return '\n'.join(lines) + '\n'
+
+def assignment_pairs(rng: random.Random, size: int) -> str:
+    """`size` pairs of section assignments"""
+    def section() -> str:
+        (start, end) = sorted((rng.randint(1, 99), rng.randint(1, 99)))
+        return f"{start}-{end}"
+    return ''.join(f"{section()},{section()}\n" for _ in range(size))
+
+def crate_moves(rng: random.Random, size: int) -> str:
+    """nine stacks of crates and `size` moves between them. moves never empty a stack, so there's always a top"""
+    heights = [rng.randint(2, 8) for _ in range(9)]
+    stacks = [[rng.choice(string.ascii_uppercase) for _ in range(h)] for h in heights]
+    lines = []
+    for level in range(max(heights), 0, -1):
+        row = (f"[{s[-level]}]" if len(s) >= level else "   " for s in stacks)
+        lines.append(' '.join(row))
+    lines.append(' '.join(f" {n} " for n in range(1, 10)))
+    lines.append('')
+    for _ in range(size):
+        source = rng.choice([i for (i, h) in enumerate(heights) if h > 1])
+        dest = rng.choice([i for i in range(9) if i != source])
+        num = rng.randint(1, min(heights[source] - 1, 6))
+        heights[source] -= num
+        heights[dest] += num
+        lines.append(f"move {num} from {source+1} to {dest+1}")
+    return '\n'.join(lines) + '\n'
+
+def datastreams(rng: random.Random, size: int) -> str:
+    """
+    a `size` character stream. it only uses three letters until the very end,
+    so both the packet and the message markers are found on the last 14 characters
+    """
+    return ''.join(rng.choices("abc", k=max(size - 14, 0))) + ''.join(rng.sample(string.ascii_lowercase, 14)) + '\n'
+
+def terminal_logs(rng: random.Random, size: int) -> str:
+    """a `$ cd`/`$ ls` transcript walking a filesystem of `size` directories"""
+    children: list[list[int]] = [[] for _ in range(size)]
+    for idx in range(1, size):
+        children[rng.randrange(idx)].append(idx)
+    lines = ["$ cd /"]
+    def walk(idx: int):
+        lines.append("$ ls")
+        entries = [f"dir d{c}" for c in children[idx]]
+        entries.extend(f"{rng.randint(1, 300000)} f{n}.txt" for n in range(rng.randint(0, 5)))
+        rng.shuffle(entries)
+        lines.extend(entries)
+        for child in children[idx]:
+            lines.append(f"$ cd d{child}")
+            walk(child)
+            lines.append("$ cd ..")
+    walk(0)
+    return '\n'.join(lines) + '\n'
+
+def tree_grids(rng: random.Random, size: int) -> str:
+    """a `size` by `size` grid of tree heights"""
+    return ''.join(''.join(rng.choices(string.digits, k=size)) + '\n' for _ in range(size))
+
+def rope_moves(rng: random.Random, size: int) -> str:
+    """`size` head movements"""
+    return ''.join(f"{rng.choice('UDLR')} {rng.randint(1, 19)}\n" for _ in range(size))
+
+def cpu_programs(rng: random.Random, size: int) -> str:
+    """`size` instructions. the screen only ever draws the first 240 cycles"""
+    return ''.join("noop\n" if rng.random() < 0.3 else f"addx {rng.randint(-10, 10) or 1}\n" for _ in range(size))
+
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53)
+
+def monkey_troops(rng: random.Random, size: int) -> str:
+    """a troop of `size` monkeys (at least 2), each holding a few items"""
+    if size < 2:
+        raise ValueError(f"need at least 2 monkeys to throw things between, got {size}")
+    monkeys = []
+    for idx in range(size):
+        others = [m for m in range(size) if m != idx]
+        operation = rng.choice((f"* {rng.randint(2, 19)}", f"+ {rng.randint(1, 8)}", "* old"))
+        items = ', '.join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 6)))
+        monkeys.append('\n'.join((
+            f"Monkey {idx}:",
+            f"  Starting items: {items}",
+            f"  Operation: new = old {operation}",
+            f"  Test: divisible by {_PRIMES[idx % len(_PRIMES)]}",
+            f"    If true: throw to monkey {rng.choice(others)}",
+            f"    If false: throw to monkey {rng.choice(others)}",
+        )))
+    return '\n\n'.join(monkeys) + '\n'
+
+def heightmaps(rng: random.Random, size: int) -> str:
+    """
+    a `size` by `size` (at least 14) heightmap ramping from S in the top left to E in the bottom right.
+    the top row and right column are left smooth so there's always a way up
+    """
+    if size < 14:
+        raise ValueError(f"heightmaps need to be at least 14 wide to climb from a to z, got {size}")
+    span = 2 * (size - 1)
+    lines = []
+    for y in range(size):
+        row = []
+        for x in range(size):
+            height = (x + y) * 25 // span
+            if y and x != size - 1:
+                height = max(0, height - rng.choice((0, 0, 0, 1, 2, 3)))
+            row.append(chr(ord('a') + height))
+        lines.append(row)
+    lines[0][0] = 'S'
+    lines[-1][-1] = 'E'
+    return '\n'.join(''.join(row) for row in lines) + '\n'
+
+def _packet(rng: random.Random, depth: int = 0) -> list:
+    def elem():
+        if depth < 4 and rng.random() < 0.3:
+            return _packet(rng, depth + 1)
+        return rng.randint(0, 10)
+    return [elem() for _ in range(rng.randint(0, 5))]
+
+def packet_pairs(rng: random.Random, size: int) -> str:
+    """`size` pairs of packets. no pair is equal, and no packet is a divider"""
+    pairs = []
+    while len(pairs) < size:
+        (left, right) = (_packet(rng), _packet(rng))
+        if left == right or any(p in ([[2]], [[6]]) for p in (left, right)):
+            continue
+        pairs.append(f"{json.dumps(left, separators=(',', ':'))}\n{json.dumps(right, separators=(',', ':'))}")
+    return '\n\n'.join(pairs) + '\n'
+
+def rock_paths(rng: random.Random, size: int) -> str:
+    """`size` rock paths under the sand source. the cave gets deeper with the square root of `size`"""
+    depth = 10 + 5 * math.isqrt(size)
+    lines = []
+    for _ in range(size):
+        (x, y) = (rng.randint(500 - depth, 500 + depth), rng.randint(5, depth))
+        points = [(x, y)]
+        horizontal = rng.random() < 0.5
+        for _ in range(rng.randint(1, 3)):
+            step = rng.randint(1, 6) * rng.choice((-1, 1))
+            if horizontal:
+                x += step
+            else:
+                y = max(5, y + step)
+            horizontal = not horizontal
+            points.append((x, y))
+        lines.append(' -> '.join(f"{px},{py}" for (px, py) in points))
+    return '\n'.join(lines) + '\n'
+
+def sensor_lists(rng: random.Random, size: int) -> str:
+    """
+    `size` sensors strung out along y=2000000, the row part 1 checks.
+    beacons are close by so the row being scanned stays short
+    """
+    lines = []
+    for _ in range(size):
+        (sx, sy) = (rng.randint(0, 20 * size), 2000000 + rng.randint(-60, 60))
+        (dx, dy) = (0, 0)
+        while (dx, dy) == (0, 0):
+            (dx, dy) = (rng.randint(-25, 25), rng.randint(-25, 25))
+        lines.append(f"Sensor at x={sx}, y={sy}: closest beacon is at x={sx+dx}, y={sy+dy}")
+    return '\n'.join(lines) + '\n'
+
+def valve_graphs(rng: random.Random, size: int) -> str:
+    """a connected network of `size` valves (2 to 676) starting from AA"""
+    names = [a + b for (a, b) in itertools.product(string.ascii_uppercase, repeat=2) if a + b != "AA"]
+    if not 2 <= size <= len(names) + 1:
+        raise ValueError(f"valve names are two letters, so size must be between 2 and {len(names) + 1}, got {size}")
+    names = ["AA"] + rng.sample(names, size - 1)
+    tunnels: list[set[int]] = [set() for _ in range(size)]
+    def connect(a: int, b: int):
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    for idx in range(1, size):
+        connect(idx, rng.randrange(idx))
+    for _ in range(size // 2):
+        (a, b) = rng.sample(range(size), 2)
+        connect(a, b)
+    lines = []
+    for (idx, name) in enumerate(names):
+        rate = 0 if idx == 0 or rng.random() < 0.6 else rng.randint(1, 25)
+        conn = [names[t] for t in sorted(tunnels[idx])]
+        if len(conn) == 1:
+            lines.append(f"Valve {name} has flow rate={rate}; tunnel leads to valve {conn[0]}")
+        else:
+            lines.append(f"Valve {name} has flow rate={rate}; tunnels lead to valves {', '.join(conn)}")
+    return '\n'.join(lines) + '\n'
+
+
+@dataclass(frozen=True)
+class Generator:
+    make: Callable[[random.Random, int], str]
+    # what a size means for this day, for the report
+    unit: str
+    # sizes the benchmark runs by default. picked so each day takes a few seconds at most
+    sizes: tuple[int, ...]
+
+GENERATORS: dict[int, Generator] = {
+    1: Generator(calorie_lists, "elves", (1000, 10000, 100000)),
+    2: Generator(rps_guides, "rounds", (10000, 100000, 1000000)),
+    3: Generator(rucksacks, "groups", (1000, 10000, 100000)),
+    4: Generator(assignment_pairs, "pairs", (1000, 10000, 100000)),
+    5: Generator(crate_moves, "moves", (1000, 10000, 100000)),
+    6: Generator(datastreams, "chars", (10000, 100000, 1000000)),
+    7: Generator(terminal_logs, "dirs", (1000, 10000, 100000)),
+    8: Generator(tree_grids, "width", (50, 100, 200)),
+    9: Generator(rope_moves, "moves", (1000, 2000, 4000)),
+    10: Generator(cpu_programs, "instructions", (1000, 10000, 100000)),
+    11: Generator(monkey_troops, "monkeys", (4, 8, 16)),
+    12: Generator(heightmaps, "width", (16, 24, 32, 40)),
+    13: Generator(packet_pairs, "pairs", (100, 300, 1000)),
+    14: Generator(rock_paths, "paths", (25, 100, 400)),
+    15: Generator(sensor_lists, "sensors", (25, 50, 100)),
+    16: Generator(valve_graphs, "valves", (10, 20, 40)),
+}
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    """makes an input for `day`. the same day, size and seed always makes the same input"""
+    try:
+        generator = GENERATORS[day]
+    except KeyError:
+        raise ValueError(f"no generator for day {day}") from None
+    return generator.make(random.Random(f"{day}:{size}:{seed}"), size)
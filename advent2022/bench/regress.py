@@ -0,0 +1,153 @@
+"""
+a performance regression gate.
+
+`record` runs each day's solver on a fixed generated input a few times and writes the
+median and p95 time of every step, plus the peak memory of a run, to a json baseline.
+`check` does the same runs and fails if anything got slower (or hungrier) than the
+baseline by more than the threshold
+"""
+import argparse
+from dataclasses import asdict, dataclass
+import json
+import math
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from typing import Iterable, Optional
+
+from advent2022.bench.generators import GENERATORS
+from advent2022.bench.scaling import write_input
+from advent2022.runner import format_ns, run_day
+
+
+@dataclass
+class StepStats:
+    median_ns: int
+    p95_ns: int
+
+@dataclass
+class DayStats:
+    day: int
+    size: int
+    seed: int
+    runs: int
+    steps: dict[str, StepStats]
+    peak_bytes: int
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'DayStats':
+        steps = {name: StepStats(**s) for (name, s) in d["steps"].items()}
+        return cls(**{**d, "steps": steps})
+
+
+def percentile(samples: list[int], pct: float) -> int:
+    """nearest-rank percentile"""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+def default_size(day: int) -> int:
+    """the middle of a day's benchmark sizes, big enough to measure but quick to run"""
+    sizes = GENERATORS[day].sizes
+    return sizes[len(sizes) // 2]
+
+def measure(day: int, *, size: Optional[int] = None, seed: int = 0, runs: int = 5) -> DayStats:
+    """times `runs` runs of a day, then does one more under tracemalloc for the peak memory"""
+    size = size or default_size(day)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = write_input(day, size, seed, tmpdir)
+        samples: dict[str, list[int]] = {}
+        for _ in range(runs):
+            for step in run_day(day, path).steps:
+                if step.implemented:
+                    samples.setdefault(step.name, []).append(step.elapsed_ns)
+        # tracemalloc slows everything down, so it gets its own run that isn't timed
+        tracemalloc.start()
+        try:
+            run_day(day, path)
+            (_, peak) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    steps = {name: StepStats(int(statistics.median(times)), percentile(times, 95)) for (name, times) in samples.items()}
+    return DayStats(day=day, size=size, seed=seed, runs=runs, steps=steps, peak_bytes=peak)
+
+def load_baseline(path: str) -> dict[int, DayStats]:
+    with open(path) as fptr:
+        return {int(day): DayStats.from_dict(d) for (day, d) in json.load(fptr).items()}
+
+def save_baseline(path: str, stats: Iterable[DayStats]):
+    with open(path, 'w') as fptr:
+        json.dump({str(s.day): asdict(s) for s in stats}, fptr, indent=2)
+
+def compare(baseline: DayStats, current: DayStats, *, threshold: float, memory_threshold: float,
+            min_delta_ns: int) -> list[str]:
+    """
+    returns a description of every regression in `current`.
+    times have to be over the threshold _and_ at least min_delta_ns slower, so
+    microsecond steps don't fail the gate on noise
+    """
+    regressions = []
+    for (name, base) in baseline.steps.items():
+        if (now := current.steps.get(name)) is None:
+            continue
+        if now.median_ns > base.median_ns * (1 + threshold) and now.median_ns - base.median_ns >= min_delta_ns:
+            regressions.append(f"day {current.day} {name}: median {format_ns(base.median_ns)} -> {format_ns(now.median_ns)}")
+    if current.peak_bytes > baseline.peak_bytes * (1 + memory_threshold):
+        regressions.append(f"day {current.day}: peak memory {baseline.peak_bytes} -> {current.peak_bytes} bytes")
+    return regressions
+
+def format_stats(stats: DayStats, baseline: Optional[DayStats] = None) -> str:
+    lines = [f"day {stats.day} (size {stats.size}, {stats.runs} runs, peak {stats.peak_bytes / 1024:.0f}KiB)"]
+    for (name, step) in stats.steps.items():
+        line = f"  {name}: median {format_ns(step.median_ns)}, p95 {format_ns(step.p95_ns)}"
+        if baseline and (base := baseline.steps.get(name)) and base.median_ns:
+            line += f" ({step.median_ns / base.median_ns - 1:+.0%} vs baseline)"
+        lines.append(line)
+    return '\n'.join(lines)
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m advent2022.bench.regress")
+    parser.add_argument("command", choices=("record", "check"), help="write a new baseline, or check against one")
+    parser.add_argument("days", type=int, nargs='*', help="days to run (default: all of them, or all in the baseline)")
+    parser.add_argument("--baseline", default="baseline.json", help="baseline json file")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per day")
+    parser.add_argument("--size", type=int, help="input size to record with, instead of each day's default")
+    parser.add_argument("--seed", type=int, default=0, help="seed to record with")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="fail when a median gets slower than this fraction (default: 0.25)")
+    parser.add_argument("--memory-threshold", type=float, default=0.25,
+                        help="fail when peak memory grows by more than this fraction (default: 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore slowdowns smaller than this many ms (default: 1)")
+    return parser
+
+if __name__ == '__main__':
+    parser = make_parser()
+    matches = parser.parse_args()
+    if unknown := [d for d in matches.days if d not in GENERATORS]:
+        parser.error(f"no generator for day(s) {unknown}")
+    if matches.command == "record":
+        recorded = []
+        for day in matches.days or sorted(GENERATORS):
+            stats = measure(day, size=matches.size, seed=matches.seed, runs=matches.runs)
+            print(format_stats(stats), flush=True)
+            recorded.append(stats)
+        save_baseline(matches.baseline, recorded)
+        sys.exit(0)
+    baseline = load_baseline(matches.baseline)
+    regressions = []
+    for day in matches.days or sorted(baseline):
+        if day not in baseline:
+            parser.error(f"day {day} isn't in {matches.baseline}, record it first")
+        base = baseline[day]
+        # same input as the baseline, or the numbers don't mean anything
+        stats = measure(day, size=base.size, seed=base.seed, runs=matches.runs)
+        print(format_stats(stats, base), flush=True)
+        regressions.extend(compare(base, stats, threshold=matches.threshold, memory_threshold=matches.memory_threshold,
+                                   min_delta_ns=int(matches.min_delta_ms * 1_000_000)))
+    if regressions:
+        print("regressions:")
+        for each in regressions:
+            print(f"  {each}")
+        sys.exit(1)
+    print("no regressions")
@@ -0,0 +1,84 @@
+import json
+import math
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from advent2022.bench.generators import GENERATORS, generate
+from advent2022.runner import RunResult, format_ns, run_day
+
+STEPS = ("parse", "part1", "part2")
+
+
+@dataclass
+class ScalingResult:
+    """how long each step of one day took at each size"""
+    day: int
+    unit: str
+    # size -> step name -> best time in ns. steps a day doesn't implement are left out
+    timings: dict[int, dict[str, int]] = field(default_factory=dict)
+
+    def exponent(self, step: str) -> Optional[float]:
+        """
+        fits time = c * size^k over the measured sizes and returns k,
+        so ~1 means linear, ~2 quadratic. None if there aren't two usable points
+        """
+        points = [(math.log(size), math.log(steps[step]))
+                  for (size, steps) in self.timings.items() if steps.get(step, 0) > 0]
+        if len(points) < 2:
+            return None
+        mean_x = sum(x for (x, _) in points) / len(points)
+        mean_y = sum(y for (_, y) in points) / len(points)
+        var = sum((x - mean_x) ** 2 for (x, _) in points)
+        if not var:
+            return None
+        return sum((x - mean_x) * (y - mean_y) for (x, y) in points) / var
+
+    def to_dict(self) -> dict:
+        return {
+            "day": self.day,
+            "unit": self.unit,
+            "timings": {str(size): steps for (size, steps) in self.timings.items()},
+            "exponents": {step: self.exponent(step) for step in STEPS},
+        }
+
+
+def write_input(day: int, size: int, seed: int, directory: str) -> str:
+    """generates an input file and returns its path"""
+    path = os.path.join(directory, f"day{day:02}-{size}-{seed}.txt")
+    with open(path, 'w') as fptr:
+        fptr.write(generate(day, size, seed))
+    return path
+
+def best_of(runs: Iterable[RunResult]) -> dict[str, int]:
+    """keeps the fastest time seen for each step"""
+    best: dict[str, int] = {}
+    for run in runs:
+        for step in run.steps:
+            if step.implemented:
+                best[step.name] = min(best.get(step.name, step.elapsed_ns), step.elapsed_ns)
+    return best
+
+def run_scaling(day: int, sizes: Optional[Iterable[int]] = None, *, seed: int = 0, repeat: int = 1) -> ScalingResult:
+    """times every step of a day's solver on generated inputs of each size"""
+    generator = GENERATORS[day]
+    result = ScalingResult(day=day, unit=generator.unit)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in (sizes or generator.sizes):
+            path = write_input(day, size, seed, tmpdir)
+            result.timings[size] = best_of(run_day(day, path) for _ in range(repeat))
+    return result
+
+def format_text(result: ScalingResult) -> str:
+    lines = [f"day {result.day}"]
+    lines.append(f"  {result.unit:>12} " + ''.join(f"{step:>12}" for step in STEPS))
+    for (size, steps) in result.timings.items():
+        cells = (format_ns(steps[step]) if step in steps else "-" for step in STEPS)
+        lines.append(f"  {size:>12} " + ''.join(f"{c:>12}" for c in cells))
+    exponents = (result.exponent(step) for step in STEPS)
+    lines.append(f"  {'scaling':>12} " + ''.join(f"{'-' if k is None else f'n^{k:.2f}':>12}" for k in exponents))
+    return '\n'.join(lines)
+
+def format_json(results: list[ScalingResult]) -> str:
+    return json.dumps([r.to_dict() for r in results], indent=2)
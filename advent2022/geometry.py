@@ -0,0 +1,72 @@
+"""
+2d points and the little helpers the grid days keep needing.
+
+Point is a NamedTuple, so it has no per-instance __dict__ (`__slots__ = ()`), and hashing and
+comparing happen in C. that matters in the hot loops, which make millions of them
+"""
+from typing import Iterator, NamedTuple
+
+# building the tuple directly skips the python-level NamedTuple.__new__
+_new = tuple.__new__
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+    def __add__(self, other: 'Point') -> 'Point': # type: ignore[override]
+        return _new(Point, (self[0] + other[0], self[1] + other[1]))
+    def __sub__(self, other: 'Point') -> 'Point':
+        return _new(Point, (self[0] - other[0], self[1] - other[1]))
+    def offset(self, dx: int, dy: int) -> 'Point':
+        """returns this point moved by (dx, dy)"""
+        return _new(Point, (self[0] + dx, self[1] + dy))
+
+ORIGIN = Point(0, 0)
+
+# right, left, down, up (in screen coordinates, where y grows downwards)
+ORTHOGONAL = (Point(1, 0), Point(-1, 0), Point(0, 1), Point(0, -1))
+DIAGONAL = (Point(1, 1), Point(-1, 1), Point(1, -1), Point(-1, -1))
+
+
+def manhattan(a: Point, b: Point) -> int:
+    """manhattan (taxicab) distance between two points"""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def chebyshev(a: Point, b: Point) -> int:
+    """chessboard distance between two points, so anything touching (diagonals too) is 1 away"""
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+def neighbors4(p: Point) -> tuple[Point, Point, Point, Point]:
+    """the points sharing an edge with `p`"""
+    (x, y) = p
+    return (_new(Point, (x + 1, y)), _new(Point, (x - 1, y)), _new(Point, (x, y + 1)), _new(Point, (x, y - 1)))
+
+def neighbors4_within(p: Point, width: int, height: int) -> Iterator[Point]:
+    """the points sharing an edge with `p` that are inside a width by height box at the origin"""
+    (x, y) = p
+    if x > 0:
+        yield _new(Point, (x - 1, y))
+    if y > 0:
+        yield _new(Point, (x, y - 1))
+    if x < width - 1:
+        yield _new(Point, (x + 1, y))
+    if y < height - 1:
+        yield _new(Point, (x, y + 1))
+
+def neighbors8(p: Point) -> Iterator[Point]:
+    """the points touching `p`, diagonals included"""
+    (x, y) = p
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dx or dy:
+                yield _new(Point, (x + dx, y + dy))
+
+def segment(start: Point, end: Point) -> list[Point]:
+    """every point on a horizontal or vertical line from start to end, inclusive, in increasing order"""
+    if start[0] == end[0]:
+        (ystart, yend) = sorted((start[1], end[1]))
+        return [_new(Point, (start[0], y)) for y in range(ystart, yend + 1)]
+    if start[1] == end[1]:
+        (xstart, xend) = sorted((start[0], end[0]))
+        return [_new(Point, (x, start[1])) for x in range(xstart, xend + 1)]
+    raise ValueError(f"cannot make a line from {start} to {end}: only straight lines are supported")
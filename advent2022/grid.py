@@ -0,0 +1,123 @@
+"""
+a dense 2d grid of bytes.
+
+cells live in one flat bytearray, row after row, so loading a puzzle is a couple of C-level
+bytes operations instead of a python loop over every character, and a cell is just
+`cells[y * width + x]`
+"""
+from typing import Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional, only DenseGrid.numpy() needs it
+    np = None
+
+from advent2022.geometry import Point, neighbors4_within
+
+# translation tables for DenseGrid.from_bytes. anything not listed keeps its byte value
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+LETTERS = bytes.maketrans(b"abcdefghijklmnopqrstuvwxyz", bytes(range(26)))
+
+
+class DenseGrid:
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width: int, height: int, fill: int = 0, *, cells: Optional[bytearray] = None):
+        if cells is None:
+            cells = bytearray([fill]) * (width * height)
+        elif len(cells) != width * height:
+            raise ValueError(f"{len(cells)} cells don't make a {width}x{height} grid")
+        self.width = width
+        self.height = height
+        self.cells = cells
+
+    @classmethod
+    def from_bytes(cls, data: bytes, table: Optional[bytes] = None) -> 'DenseGrid':
+        """
+        loads a grid from the text of a puzzle input, one row per line (\\n or \\r\\n).
+        `table` is a bytes.translate table applied to every cell on the way in
+        """
+        data = data.rstrip(b"\r\n")
+        newline = data.find(b"\n")
+        width = len(data) if newline == -1 else newline - (data[newline-1:newline] == b"\r")
+        height = data.count(b"\n") + 1 if data else 0
+        cells = bytearray(data.translate(table, b"\r\n"))
+        if len(cells) != width * height:
+            raise ValueError(f"expected {height} rows of {width}, but the lines have different lengths")
+        return cls(width, height, cells=cells)
+
+    @classmethod
+    def load(cls, path: str, table: Optional[bytes] = None) -> 'DenseGrid':
+        with open(path, 'rb') as fptr:
+            return cls.from_bytes(fptr.read(), table)
+
+    def __repr__(self) -> str:
+        return f"DenseGrid(width={self.width}, height={self.height})"
+
+    def in_bounds(self, p: Point) -> bool:
+        (x, y) = p
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    __contains__ = in_bounds
+
+    def index(self, p: Point) -> int:
+        """flat index of a point. raises IndexError outside the grid instead of wrapping to another row"""
+        (x, y) = p
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"{p} is outside a {self.width}x{self.height} grid")
+        return y * self.width + x
+
+    def point(self, index: int) -> Point:
+        """the point for a flat index"""
+        (y, x) = divmod(index, self.width)
+        return Point(x, y)
+
+    def __getitem__(self, p: Point) -> int:
+        return self.cells[self.index(p)]
+
+    def __setitem__(self, p: Point, value: int):
+        self.cells[self.index(p)] = value
+
+    def row(self, y: int) -> memoryview:
+        """row y, as a view into the grid"""
+        if not 0 <= y < self.height:
+            raise IndexError(f"row {y} is outside a grid of height {self.height}")
+        return memoryview(self.cells)[y * self.width:(y + 1) * self.width]
+
+    def column(self, x: int) -> memoryview:
+        """column x, as a (strided) view into the grid"""
+        if not 0 <= x < self.width:
+            raise IndexError(f"column {x} is outside a grid of width {self.width}")
+        return memoryview(self.cells)[x::self.width]
+
+    def rows(self) -> list[memoryview]:
+        return [self.row(y) for y in range(self.height)]
+
+    def columns(self) -> list[memoryview]:
+        return [self.column(x) for x in range(self.width)]
+
+    def neighbors(self, p: Point) -> Iterator[Point]:
+        """the up to four points next to `p` that are inside the grid"""
+        return neighbors4_within(p, self.width, self.height)
+
+    def find(self, value: int) -> Point:
+        """the first point holding `value`. raises ValueError if there isn't one"""
+        return self.point(self.cells.index(value))
+
+    def find_all(self, value: int) -> Iterator[Point]:
+        """every point holding `value`, in row order"""
+        idx = self.cells.find(value)
+        while idx != -1:
+            yield self.point(idx)
+            idx = self.cells.find(value, idx + 1)
+
+    def numpy(self) -> 'np.ndarray':
+        """a (height, width) uint8 array sharing memory with the grid, so writes go both ways"""
+        if np is None:
+            raise ImportError("DenseGrid.numpy() needs numpy installed")
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+
+    def render(self, table: Optional[bytes] = None) -> str:
+        """the grid as text, one line per row, optionally translating the cells back first"""
+        cells = bytes(self.cells).translate(table) if table else bytes(self.cells)
+        return '\n'.join(cells[y * self.width:(y + 1) * self.width].decode('latin-1') for y in range(self.height))
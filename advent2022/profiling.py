@@ -0,0 +1,97 @@
+"""
+opt-in instrumentation for the solvers.
+
+everything here is a no-op unless profiling is on, either with ADVENT2022_PROFILE=1 in the
+environment or `python -m advent2022 run --profile`. the switch is read when a solver module
+is decorated, so it has to be flipped before the day gets imported (the runner imports lazily,
+so that works out). with it off, `profiled` hands back the undecorated function and `count`
+returns straight away
+"""
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+import functools
+import os
+import time
+from typing import Callable, Iterator, Optional, TypeVar
+
+ENV_VAR = "ADVENT2022_PROFILE"
+
+F = TypeVar("F", bound=Callable)
+
+_enabled: bool = os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+@dataclass
+class Timing:
+    calls: int = 0
+    elapsed_ns: int = 0
+
+# counter name -> count, e.g. "a_star.pops"
+counters: Counter[str] = Counter()
+# function or section name -> calls and cumulative time
+timings: dict[str, Timing] = {}
+
+
+def enabled() -> bool:
+    return _enabled
+
+def enable(on: bool = True):
+    """turns profiling on (or off). only affects modules imported after this"""
+    global _enabled
+    _enabled = on
+
+def reset():
+    counters.clear()
+    timings.clear()
+
+def count(name: str, n: int = 1):
+    """bumps a counter, like nodes expanded or grains dropped"""
+    if _enabled:
+        counters[name] += n
+
+def _record(name: str, elapsed_ns: int):
+    timing = timings.setdefault(name, Timing())
+    timing.calls += 1
+    timing.elapsed_ns += elapsed_ns
+
+def profiled(name: Optional[str] = None) -> Callable[[F], F]:
+    """decorator counting the calls of a function and the time spent in it"""
+    def decorator(func: F) -> F:
+        if not _enabled:
+            return func
+        label = name or func.__qualname__
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(label, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+@contextmanager
+def _timed_section(name: str) -> Iterator[None]:
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter_ns() - start)
+
+def section(name: str):
+    """context manager timing a block, the same way `profiled` times a function"""
+    return _timed_section(name) if _enabled else nullcontext()
+
+def report() -> str:
+    """everything collected so far, as text"""
+    lines = []
+    if timings:
+        lines.append(f"{'calls':>10} {'cumulative':>12}  function")
+        for (name, t) in sorted(timings.items(), key=lambda kv: kv[1].elapsed_ns, reverse=True):
+            lines.append(f"{t.calls:>10} {t.elapsed_ns / 1_000_000:>10.2f}ms  {name}")
+    if counters:
+        lines.append(f"{'count':>10}  counter")
+        for (name, n) in sorted(counters.items()):
+            lines.append(f"{n:>10}  {name}")
+    return '\n'.join(lines)
@@ -0,0 +1,112 @@
+import contextlib
+import cProfile
+import importlib
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Optional
+
+from advent2022 import DAY_MODULES
+
+
+@dataclass
+class Step:
+    """one timed call into a day module"""
+    name: str
+    elapsed_ns: int = 0
+    answer: Any = None
+    implemented: bool = True
+
+@dataclass
+class RunResult:
+    day: int
+    input: str
+    steps: list[Step] = field(default_factory=list)
+    # whatever the solvers printed along the way
+    output: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "day": self.day,
+            "input": self.input,
+            "steps": {
+                s.name: {
+                    "elapsed_ns": s.elapsed_ns,
+                    "answer": s.answer if isinstance(s.answer, (int, float, str)) or s.answer is None else str(s.answer),
+                    "implemented": s.implemented,
+                }
+                for s in self.steps
+            },
+        }
+
+
+def load_day(day: int) -> ModuleType:
+    """imports the module for a day. only the day being run gets imported"""
+    try:
+        name = DAY_MODULES[day]
+    except KeyError:
+        raise ValueError(f"no puzzle for day {day}, expected one of {min(DAY_MODULES)}..{max(DAY_MODULES)}") from None
+    return importlib.import_module(name)
+
+def _timed(func, *args, profiler: Optional[cProfile.Profile] = None) -> tuple[int, Any]:
+    if profiler is not None:
+        profiler.enable()
+    start = time.perf_counter_ns()
+    try:
+        answer = func(*args)
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        if profiler is not None:
+            profiler.disable()
+    return (elapsed, answer)
+
+def run_day(day: int, path: str, parts: tuple[int, ...] = (1, 2), *,
+            profiler: Optional[cProfile.Profile] = None) -> RunResult:
+    """
+    parses `path` with a day's module and then solves the requested parts, timing each step.
+    if a profiler is passed in, it's only switched on while the steps run
+    """
+    module = load_day(day)
+    result = RunResult(day=day, input=path)
+    captured = io.StringIO()
+    with contextlib.redirect_stdout(captured):
+        (elapsed, parsed) = _timed(module.parse, path, profiler=profiler)
+        result.steps.append(Step("parse", elapsed))
+        for part in parts:
+            solver = getattr(module, f"part{part}", None)
+            if solver is None:
+                result.steps.append(Step(f"part{part}", implemented=False))
+                continue
+            (elapsed, answer) = _timed(solver, parsed, profiler=profiler)
+            result.steps.append(Step(f"part{part}", elapsed, answer))
+    result.output = captured.getvalue()
+    return result
+
+def format_ns(ns: int) -> str:
+    for (unit, scale) in (("s", 1_000_000_000), ("ms", 1_000_000), ("us", 1_000)):
+        if ns >= scale:
+            return f"{ns / scale:.2f}{unit}"
+    return f"{ns}ns"
+
+def format_text(result: RunResult, verbose: bool = False) -> str:
+    lines = []
+    if verbose and result.output:
+        lines.append(result.output.rstrip('\n'))
+    lines.append(f"day {result.day} ({result.input})")
+    for step in result.steps:
+        if not step.implemented:
+            lines.append(f"  {step.name}: not implemented")
+        elif step.name == "parse":
+            lines.append(f"  {step.name}: {format_ns(step.elapsed_ns)}")
+        else:
+            answer = str(step.answer)
+            if '\n' in answer:
+                # multi-line answers (day 10's screen) go below the timing
+                answer = '\n' + answer
+            lines.append(f"  {step.name}: {format_ns(step.elapsed_ns)} -> {answer}")
+    return '\n'.join(lines)
+
+def format_json(result: RunResult) -> str:
+    return json.dumps(result.to_dict(), indent=2)
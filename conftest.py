@@ -0,0 +1,2 @@
+# an empty conftest at the repo root puts the root on sys.path, so the tests can import the days
+# as `dayNN.module` (the same way the runner does). run pytest from the repo root
\ No newline at end of file
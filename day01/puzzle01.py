@@ -1,11 +1,18 @@
 """see https://adventofcode.com/2022/day/1"""
 
 from argparse import ArgumentParser
-from typing import Iterator
+from dataclasses import dataclass
+import heapq
+import itertools
+import multiprocessing
+import os
+from typing import Iterable, Iterator
 
 def make_parser() -> ArgumentParser:
     parser = ArgumentParser()
     parser.add_argument("input", help="input file")
+    parser.add_argument("--top", type=int, default=3, metavar="K", help="how many of the top elves to total up")
+    parser.add_argument("--processes", type=int, metavar="N", help="split the file up and sum it in N worker processes")
     return parser
 
 def split_on(s, seq):
@@ -19,15 +26,124 @@ def split_on(s, seq):
             acc.append(each)
     yield acc
 
+def top_k_totals(lines: Iterable[str], k: int) -> list[int]:
+    """
+    sums each group of lines as they arrive and returns the k largest totals, largest first.
+    only the best k totals are ever kept around (in a min-heap), so memory doesn't grow with the input
+    """
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}")
+    best: list[int] = []
+    total = 0
+    for line in itertools.chain(lines, [""]): # the sentinel closes off the last group
+        stripped = line.strip()
+        if stripped.isnumeric():
+            total += int(stripped)
+            continue
+        _keep_best(best, total, k)
+        total = 0
+    return sorted(best, reverse=True)
+
+def _keep_best(best: list[int], total: int, k: int):
+    """adds total to the min-heap `best` if it's one of the k largest so far"""
+    if len(best) < k:
+        heapq.heappush(best, total)
+    elif total > best[0]:
+        heapq.heapreplace(best, total)
+
+@dataclass
+class ChunkTotals:
+    """what a worker found in its byte range of the input"""
+    head: int # sum of the numbers before the first separator (or the whole chunk, if there isn't one)
+    best: list[int] # top k of the groups that started and ended inside the chunk
+    tail: int # sum of the numbers after the last separator
+    has_separator: bool
+
+def _chunk_totals(path: str, start: int, end: int, k: int) -> ChunkTotals:
+    """sums up the groups in bytes [start, end) of `path`, which both fall on the start of a line"""
+    with open(path, 'rb') as fptr:
+        fptr.seek(start)
+        lines = fptr.read(end - start).decode().splitlines()
+    chunk = ChunkTotals(head=0, best=[], tail=0, has_separator=False)
+    total = 0
+    for line in lines:
+        stripped = line.strip()
+        if stripped.isnumeric():
+            total += int(stripped)
+        elif not chunk.has_separator:
+            chunk.head = total
+            chunk.has_separator = True
+            total = 0
+        else:
+            _keep_best(chunk.best, total, k)
+            total = 0
+    if chunk.has_separator:
+        chunk.tail = total
+    else:
+        chunk.head = total
+    return chunk
+
+def _line_boundaries(path: str, num_chunks: int) -> list[int]:
+    """splits `path` into roughly even byte ranges, nudging each boundary forward to the start of a line"""
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, 'rb') as fptr:
+        for nominal in range(1, num_chunks):
+            offset = max(size * nominal // num_chunks, boundaries[-1])
+            if offset > 0:
+                fptr.seek(offset - 1)
+                offset += len(fptr.readline()) - 1
+            if offset > boundaries[-1]:
+                boundaries.append(offset)
+    if size > boundaries[-1]:
+        boundaries.append(size)
+    return boundaries
+
+def top_k_totals_parallel(path: str, k: int, *, processes: int | None = None, chunk_size: int = 64 << 20) -> list[int]:
+    """
+    same as top_k_totals, but the file is split into byte ranges that are summed in a pool of worker processes.
+    a group that straddles a range boundary comes back as the tail of one range and the head of the next,
+    and gets stitched back together here
+    """
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}")
+    processes = processes or os.cpu_count() or 1
+    num_chunks = max(processes, -(-os.path.getsize(path) // chunk_size))
+    boundaries = _line_boundaries(path, num_chunks)
+    best: list[int] = []
+    carry = 0
+    with multiprocessing.Pool(processes) as pool:
+        args = [(path, start, end, k) for (start, end) in itertools.pairwise(boundaries)]
+        for chunk in pool.starmap(_chunk_totals, args):
+            if not chunk.has_separator:
+                carry += chunk.head
+                continue
+            _keep_best(best, carry + chunk.head, k)
+            for total in chunk.best:
+                _keep_best(best, total, k)
+            carry = chunk.tail
+    _keep_best(best, carry, k)
+    return sorted(best, reverse=True)
+
+def parse(path: str) -> list[int]:
+    """reads the calorie total of every elf"""
+    with open(path) as fptr:
+        nums = [int(l) if l.strip().isnumeric() else None for l in fptr]
+    return list(map(sum, split_on(None, nums)))
+
+def part1(cals: list[int]) -> int:
+    return max(cals)
+
+def part2(cals: list[int]) -> int:
+    return sum(heapq.nlargest(3, cals))
+
 if __name__ == '__main__':
     matches = make_parser().parse_args()
-    with open(matches.input, 'r') as fptr:
-        input = fptr.readlines()
-    nums = [int(l) if l.strip().isnumeric() else None for l in input]
-    elves_split: list[list[int]] = list(split_on(None, nums))
-    cals: list[int] = list(map(sum, elves_split))
-    print(max(cals))
-    cals.sort(reverse=True)
-    top_3: list[int] = cals[:3]
-    print(f"top 3: {top_3}")
-    print(f"total of top 3: {sum(top_3)}")
\ No newline at end of file
+    if matches.processes:
+        top_k = top_k_totals_parallel(matches.input, matches.top, processes=matches.processes)
+    else:
+        with open(matches.input, 'r') as fptr:
+            top_k = top_k_totals(fptr, matches.top)
+    print(top_k[0])
+    print(f"top {matches.top}: {top_k}")
+    print(f"total of top {matches.top}: {sum(top_k)}")
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""checks the streaming and parallel top-k totals against the original split_on pipeline"""
+import random
+
+import pytest
+
+from day01.puzzle01 import split_on, top_k_totals, top_k_totals_parallel
+
+def random_calories(rng: random.Random) -> str:
+    """groups of numbers split by blank lines, sometimes with an extra blank line or a few trailing ones"""
+    groups = []
+    for _ in range(rng.randint(1, 30)):
+        groups.append('\n'.join(str(rng.randint(1, 60000)) for _ in range(rng.randint(1, 6))))
+        if rng.random() < 0.1:
+            groups.append('') # an empty group in the middle
+    return '\n\n'.join(groups) + '\n' * rng.randint(0, 3)
+
+def split_on_totals(text: str, k: int) -> list[int]:
+    """the original pipeline: split on the blank lines, sum each group, largest first"""
+    nums = [int(l) if l.strip().isnumeric() else None for l in text.splitlines()]
+    return sorted(map(sum, split_on(None, nums)), reverse=True)[:k]
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_parallel_matches_split_on(tmp_path, seed: int, newline: str):
+    rng = random.Random(seed)
+    text = random_calories(rng)
+    path = tmp_path / "input.txt"
+    path.write_bytes(text.replace('\n', newline).encode())
+    k = rng.choice([1, 3, 50])
+    expected = split_on_totals(text, k)
+    assert top_k_totals(text.splitlines(), k) == expected
+    # tiny chunks, so plenty of groups straddle a chunk boundary
+    chunk_size = rng.randint(1, 40)
+    assert top_k_totals_parallel(str(path), k, processes=2, chunk_size=chunk_size) == expected
+
+def test_k_must_be_positive(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("1\n")
+    with pytest.raises(ValueError):
+        top_k_totals(["1"], 0)
+    with pytest.raises(ValueError):
+        top_k_totals_parallel(str(path), 0)
\ No newline at end of file
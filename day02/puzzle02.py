@@ -3,6 +3,9 @@
 from abc import ABCMeta
 from argparse import ArgumentParser
 from enum import Enum
+import mmap
+import os
+from typing import Iterable, Tuple
 
 def add_score(object):
     def score(self) -> int:
@@ -100,11 +103,86 @@ def score_game(enemy: EnemyMove, ours: OurMove) -> int:
     outcome = Outcome.from_game(enemy, ours)
     return ours.score() + outcome.score()
 
+# every possible line, in the order used by the score tables below
+ROUND_TYPES: list[bytes] = [f"{e} {o}".encode() for e in "ABC" for o in "XYZ"]
+
+def _make_score_tables() -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """scores every possible line once for each decryption, using the enums above"""
+    part1 = []
+    part2 = []
+    for each in ROUND_TYPES:
+        (enemy_txt, our_txt) = each.decode().split(' ')
+        enemy = EnemyMove(enemy_txt)
+        part1.append(score_game(enemy, OurMove(our_txt)))
+        part2.append(score_game(enemy, OurMove.from_desired_outcome(enemy, our_txt)))
+    return (tuple(part1), tuple(part2))
+
+(PART1_SCORES, PART2_SCORES) = _make_score_tables()
+
+def score_lines(lines: Iterable[str]) -> Tuple[int, int]:
+    """
+    scores both decryptions in one pass over the lines, with a table lookup per line.
+    takes the same lines count_rounds does: trailing whitespace and blank lines are fine, anything else raises ValueError
+    """
+    (total1, total2) = (0, 0)
+    for line in lines:
+        text = line.rstrip()
+        if not text:
+            continue
+        (enemy, ours) = (ord(text[0]) - ord('A'), ord(text[-1]) - ord('X'))
+        if len(text) != 3 or text[1] != ' ' or not (0 <= enemy < 3 and 0 <= ours < 3):
+            raise ValueError(f"not a round: {line!r}")
+        idx = enemy * 3 + ours
+        total1 += PART1_SCORES[idx]
+        total2 += PART2_SCORES[idx]
+    return (total1, total2)
+
+def count_rounds(path: str, chunk_size: int = 1 << 24) -> list[int]:
+    """
+    counts how many times each of the 9 possible lines shows up in a strategy guide.
+    the file is memory-mapped and each line type is counted with bytes.count, so python never sees a line.
+    trailing whitespace and blank lines are fine, anything else that isn't a round raises ValueError
+    """
+    counts = [0] * len(ROUND_TYPES)
+    whitespace_bytes = 0
+    size = os.path.getsize(path)
+    if not size:
+        return counts
+    with open(path, 'rb') as fptr, mmap.mmap(fptr.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        start = 0
+        while start < size:
+            # end each chunk on a newline so no line is split between two chunks
+            end = mapped.find(b"\n", min(start + chunk_size, size) - 1) + 1 or size
+            # each chunk starts a line, so with a newline in front every hit has to start a line too
+            chunk = b"\n" + mapped[start:end]
+            for (idx, each) in enumerate(ROUND_TYPES):
+                counts[idx] += chunk.count(b"\n" + each)
+            whitespace_bytes += sum(chunk.count(each) for each in (b"\n", b"\r", b" ", b"\t")) - 1
+            start = end
+    # each round is 3 bytes (with one space in it) at the start of a line. if everything else is whitespace,
+    # the sizes add up. any stray byte, or a round that doesn't start its line, leaves them short
+    rounds = sum(counts)
+    if rounds * 2 + whitespace_bytes != size:
+        raise ValueError(f"{path} has lines that aren't rounds (found {rounds} rounds in {size} bytes)")
+    return counts
+
+def score_file(path: str) -> Tuple[int, int]:
+    """scores both decryptions of a strategy guide, by counting each line type once"""
+    counts = parse(path)
+    return (part1(counts), part2(counts))
+
+def parse(path: str) -> list[int]:
+    """counts each type of round in the guide"""
+    return count_rounds(path)
+
+def part1(counts: list[int]) -> int:
+    return sum(c * s for (c, s) in zip(counts, PART1_SCORES))
+
+def part2(counts: list[int]) -> int:
+    return sum(c * s for (c, s) in zip(counts, PART2_SCORES))
+
 if __name__ == '__main__':
     matches = make_parser().parse_args()
-    with open(matches.input, 'r') as fptr:
-        lines = fptr.readlines()
-    games_1 = decrypt_part1(lines)
-    print(sum(score_game(e, o) for (e, o) in games_1))
-    games_2 = decrypt_part2(lines)
-    print(sum(score_game(e, o) for (e, o) in games_2))
\ No newline at end of file
+    (total1, total2) = score_file(matches.input)
+    print(total1)
+    print(total2)
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""checks that both scorers agree on the score, and on what isn't a strategy guide"""
+import pytest
+
+from day02.puzzle02 import count_rounds, part1, part2, score_lines
+
+@pytest.mark.parametrize("data", [
+    b"A Y\nB X\nC Z\n",
+    b"A Y\r\nB X\r\nC Z",
+    b"A Y \nB X\t\n\nC Z\n\n",
+    b"",
+])
+def test_scorers_agree(tmp_path, data: bytes):
+    path = tmp_path / "input.txt"
+    path.write_bytes(data)
+    counts = count_rounds(str(path), chunk_size=4)
+    assert (part1(counts), part2(counts)) == score_lines(data.decode().splitlines())
+
+def test_sample():
+    assert score_lines(["A Y", "B X", "C Z"]) == (15, 12)
+
+@pytest.mark.parametrize("data", [b"@ X\n", b"A\n", b" A X\n", b"A  X\n", b"A X\nA XB Y\n", b"A XY\n", b"D X\n"])
+def test_scorers_reject_the_same_lines(tmp_path, data: bytes):
+    path = tmp_path / "input.txt"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        count_rounds(str(path))
+    with pytest.raises(ValueError):
+        score_lines(data.decode().splitlines())
\ No newline at end of file
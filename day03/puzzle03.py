@@ -3,8 +3,73 @@ https://adventofcode.com/2022/day/3
 but make it cursed
 """
 
-# part 1
-print(sum(["0abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ".index(next(iter(set(t[:len(t)//2]) & set(t[len(t)//2:])))) for t in [line.strip() for line in open('input.txt').readlines()]]))
-# part 2
+from argparse import ArgumentParser
+from functools import reduce
 import itertools
-sum(["0abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ".index(next(iter(set.intersection(*[set(s) for s in t])))) for t in itertools.zip_longest(*[iter(open('input.txt').read().splitlines())]*3, fillvalue=" ")])
\ No newline at end of file
+import operator
+from typing import Iterable
+
+PRIORITIES = "0abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# each item byte maps to a single bit, where the bit's position is the item's priority - 1.
+# a whole rucksack (or half of one) becomes a 52-bit mask, and items in common are just `&`
+ITEM_BITS: list[int] = [0] * 256
+for (_priority, _item) in enumerate(PRIORITIES[1:], start=1):
+    ITEM_BITS[ord(_item)] = 1 << (_priority - 1)
+
+def make_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument("input", help="input file")
+    return parser
+
+def item_mask(items: bytes) -> int:
+    """returns the mask of every item in `items`"""
+    return reduce(operator.or_, map(ITEM_BITS.__getitem__, items), 0)
+
+def common_priority(*masks: int) -> int:
+    """returns the priority of the one item that every mask has in common"""
+    common = reduce(operator.and_, masks)
+    if not common:
+        raise ValueError("no item in common")
+    return common.bit_length() # highest bit set, which is the only bit set
+
+def part1(lines: Iterable[bytes]) -> int:
+    """sums the priorities of the item in both compartments of each rucksack"""
+    total = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        half = len(line) // 2
+        total += common_priority(item_mask(line[:half]), item_mask(line[half:]))
+    return total
+
+def part2(lines: Iterable[bytes]) -> int:
+    """sums the priorities of the badge shared by each group of three rucksacks"""
+    total = 0
+    rucksacks = (item_mask(line.strip()) for line in lines if line.strip())
+    for group in itertools.zip_longest(*[rucksacks] * 3):
+        if None in group:
+            raise ValueError("number of rucksacks isn't a multiple of 3")
+        total += common_priority(*group)
+    return total
+
+# the original one-liners, now with less import-time file reading
+
+def cursed_part1(path: str) -> int:
+    return sum([PRIORITIES.index(next(iter(set(t[:len(t)//2]) & set(t[len(t)//2:])))) for t in [line.strip() for line in open(path).readlines()]])
+
+def cursed_part2(path: str) -> int:
+    return sum([PRIORITIES.index(next(iter(set.intersection(*[set(s) for s in t])))) for t in itertools.zip_longest(*[iter(open(path).read().splitlines())]*3, fillvalue=" ")])
+
+def parse(path: str) -> list[bytes]:
+    """reads the rucksacks (part1 and part2 above take the lines as-is)"""
+    with open(path, 'rb') as fptr:
+        return fptr.read().splitlines()
+
+if __name__ == '__main__':
+    matches = make_parser().parse_args()
+    with open(matches.input, 'rb') as fptr:
+        print(f"part 1: {part1(fptr)}")
+    with open(matches.input, 'rb') as fptr:
+        print(f"part 2: {part2(fptr)}")
\ No newline at end of file
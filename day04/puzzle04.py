@@ -1,5 +1,11 @@
 """https://adventofcode.com/2022/day/4"""
-from typing import Iterator, Tuple
+import bisect
+from typing import Iterable, Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional, only load_pairs and count_pairs_np need it
+    np = None
 
 def make_ranges(lines: list[str]) -> Iterator[Tuple[range, range]]:
     """take a list of lines, each with two assignments deliminted by comma, and make ranges from them"""
@@ -13,16 +19,109 @@ def make_ranges(lines: list[str]) -> Iterator[Tuple[range, range]]:
 
 def has_subset(range1: range, range2: range) -> bool:
     """returns true if range1 and range2 overlap"""
+    # compare the endpoints rather than building sets (ranges from make_ranges always have a step of 1)
+    if not range1 or not range2:
+        return True # the empty range is a subset of everything
+    return (range1.start >= range2.start and range1.stop <= range2.stop) or \
+           (range2.start >= range1.start and range2.stop <= range1.stop)
+
+def has_any_overlap(range1: range, range2: range) -> bool:
+    """returns true if range1 and range2 have any values in common"""
+    return max(range1.start, range2.start) < min(range1.stop, range2.stop)
+
+def has_subset_sets(range1: range, range2: range) -> bool:
+    """has_subset, the slow way. works for any step"""
     sr1 = set(range1)
     sr2 = set(range2)
     return sr1 <= sr2 or sr1 >= sr2
 
-def has_any_overlap(range1: range, range2: range) -> bool:
-    """returns true if range1 and range2 have any values in common"""
+def has_any_overlap_sets(range1: range, range2: range) -> bool:
+    """has_any_overlap, the slow way. works for any step"""
     sr1 = set(range1)
     sr2 = set(range2)
     return bool(sr1 & sr2)
 
+class AssignmentIndex:
+    """
+    answers "how many assignments overlap/contain this range" without rescanning every assignment.
+
+    keeps the assignment starts and ends sorted separately: anything that doesn't start after the query
+    or end before it must overlap it, so that's two bisects. containment needs both endpoints at once,
+    so those queries are answered together in a sweep over a Fenwick tree
+    """
+    def __init__(self, assignments: Iterable[range]):
+        # (first, last) of each non-empty assignment, ordered by first
+        self._spans = sorted((r.start, r.stop - 1) for r in assignments if r)
+        self._starts = [first for (first, _) in self._spans]
+        self._ends = sorted(last for (_, last) in self._spans)
+    def __len__(self) -> int:
+        return len(self._spans)
+    def count_overlapping(self, query: range) -> int:
+        """returns the number of assignments with any values in common with `query`"""
+        if not query:
+            return 0
+        starts_after = len(self._starts) - bisect.bisect_right(self._starts, query.stop - 1)
+        ends_before = bisect.bisect_left(self._ends, query.start)
+        return len(self) - starts_after - ends_before
+    def count_containing(self, queries: Iterable[range]) -> list[int]:
+        """returns the number of assignments that fully contain each query"""
+        queries = list(queries)
+        counts = [len(self)] * len(queries) # everything contains the empty range
+        tree = [0] * (len(self._ends) + 1)
+        added = 0
+        for qidx in sorted(range(len(queries)), key=lambda i: queries[i].start):
+            query = queries[qidx]
+            if not query:
+                continue
+            # add every assignment that starts early enough, keyed by where its end sorts
+            while added < len(self._spans) and self._spans[added][0] <= query.start:
+                pos = bisect.bisect_left(self._ends, self._spans[added][1]) + 1
+                while pos < len(tree):
+                    tree[pos] += 1
+                    pos += pos & -pos
+                added += 1
+            # ...and count the ones that also end late enough
+            pos = bisect.bisect_left(self._ends, query.stop - 1)
+            ends_too_soon = 0
+            while pos > 0:
+                ends_too_soon += tree[pos]
+                pos -= pos & -pos
+            counts[qidx] = added - ends_too_soon
+        return counts
+
+def load_pairs(data: bytes) -> 'np.ndarray':
+    """
+    parses a whole "a-b,c-d" file into an (N, 4) array of [a, b, c, d] rows.
+    the separators are swapped for spaces so numpy can parse every number in one go
+    """
+    if np is None:
+        raise ImportError("load_pairs() needs numpy installed")
+    text = data.translate(_SEPARATORS_TO_SPACES).decode()
+    nums = np.fromstring(text, dtype=np.int64, sep=' ')
+    if nums.size % 4:
+        raise ValueError(f"expected 4 numbers per line, got {nums.size} numbers in total")
+    return nums.reshape(-1, 4)
+
+_SEPARATORS_TO_SPACES = bytes.maketrans(b"-,", b"  ")
+
+def count_pairs_np(pairs: 'np.ndarray') -> Tuple[int, int]:
+    """returns (pairs where one contains the other, pairs with any overlap) for an array from load_pairs"""
+    (start1, end1, start2, end2) = pairs.T
+    contained = ((start1 <= start2) & (end2 <= end1)) | ((start2 <= start1) & (end1 <= end2))
+    overlapping = (start1 <= end2) & (start2 <= end1)
+    return (int(contained.sum()), int(overlapping.sum()))
+
+def parse(path: str) -> list[Tuple[range, range]]:
+    """reads the pairs of assignments"""
+    with open(path) as fptr:
+        return list(make_ranges(fptr.read().splitlines()))
+
+def part1(ranges: list[Tuple[range, range]]) -> int:
+    return sum(1 for (r1, r2) in ranges if has_subset(r1, r2))
+
+def part2(ranges: list[Tuple[range, range]]) -> int:
+    return sum(1 for (r1, r2) in ranges if has_any_overlap(r1, r2))
+
 if __name__ == '__main__':
     with open('input.txt') as fptr:
         lines = fptr.read().splitlines()
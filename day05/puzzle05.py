@@ -1,10 +1,9 @@
 """https://adventofcode.com/2022/day/5"""
-import copy
 from dataclasses import dataclass
 from enum import Enum
 import itertools
 import re
-from typing import Iterator, Tuple
+from typing import Iterable, Iterator, Sequence, Tuple
 
 _MOVE_RE = re.compile(r"^move\s+(?P<move>\d+)\s+from\s+(?P<from>\d+)\s+to\s+(?P<to>\d+)")
 
@@ -58,6 +57,17 @@ def parse_lines(lines: list[str]) -> Tuple[list[list[str]], list[Move]]:
     moves = parse_move_lines(moves_text)
     return (stacks, moves)
 
+def parse_stream(lines: Iterable[str]) -> Tuple[list[list[str]], Iterator[Move]]:
+    """
+    like parse_lines, but only reads up to the empty line before returning.
+    the moves are parsed lazily as they're iterated, so the rest of the input is never held in memory
+    """
+    it = (line.rstrip("\r\n") for line in lines)
+    stacks_text = list(itertools.takewhile(lambda s: s.strip(), it))
+    stacks = parse_stack_lines(stacks_text)
+    moves = (Move.parse(t) for t in it if t.strip())
+    return (stacks, moves)
+
 class InsertOrder(Enum):
     """Defines an Insertion Order"""
     Maintained = 0,
@@ -78,16 +88,98 @@ def perform_move(move: Move, stacks: list[list[str]], *, order=InsertOrder.Rever
     [stacks[move.dest].insert(0, i) for i in items] # annoying, list.insert only takes 1 element at a time
     return stacks
 
+def to_top_last(stacks: list[list[str]]) -> list[list[str]]:
+    """flips stacks from parse_stack_lines (top crate first) so the top crate is last"""
+    return [s[::-1] for s in stacks]
+
+def perform_move_top_last(move: Move, stacks: list[list[str]], *, order=InsertOrder.Reversed):
+    """
+    performs a Move in-place on stacks stored top-last (see to_top_last).
+
+    the top of the stack is the end of the list, so moving n crates is a single slice and extend
+    instead of popping and inserting at the front one crate at a time
+    """
+    source = stacks[move.source]
+    if move.num > len(source):
+        raise ValueError(f"can't move {move.num} crates from a stack of {len(source)}: {move}")
+    split = len(source) - move.num
+    items = source[split:]
+    del source[split:]
+    if order.is_reversed:
+        items.reverse() # the crane moves them one at a time
+    stacks[move.dest].extend(items)
+    return stacks
+
+def tops_top_last(stacks: list[list[str]]) -> str:
+    """returns the top crate of each stack stored top-last"""
+    return ''.join(s[-1] for s in stacks)
+
+def perform_moves_both(stacks: list[list[str]], moves: Iterable[Move]) -> Tuple[list[list[str]], list[list[str]]]:
+    """
+    runs the moves against two top-last copies of `stacks` at once, one for each InsertOrder,
+    returning (reversed, maintained). each move is only parsed once, and `moves` can be a lazy iterator
+    """
+    stacks_rev = to_top_last(stacks)
+    stacks_kept = to_top_last(stacks)
+    for move in moves:
+        perform_move_top_last(move, stacks_rev, order=InsertOrder.Reversed)
+        perform_move_top_last(move, stacks_kept, order=InsertOrder.Maintained)
+    return (stacks_rev, stacks_kept)
+
+def tops_by_tracing(stacks: list[list[str]], moves: Sequence[Move], *, order=InsertOrder.Reversed) -> str:
+    """
+    returns the top crate of each stack after `moves` without moving any crates.
+
+    we only ever look at the tops, so instead of shuffling everything around, figure out where each final
+    top crate was to begin with by following its (stack, depth from the top) position back through the moves.
+    that's O(moves * stacks) no matter how many crates there are. `stacks` is top-first, from parse_stack_lines
+    """
+    heights = [len(s) for s in stacks]
+    for move in moves:
+        if move.num > heights[move.source]:
+            raise ValueError(f"can't move {move.num} crates from a stack of {heights[move.source]}: {move}")
+        heights[move.source] -= move.num
+        heights[move.dest] += move.num
+    # (stack, depth) of each final top, skipping stacks that end up empty
+    positions = [[idx, 0] for (idx, height) in enumerate(heights) if height]
+    for move in reversed(moves):
+        for pos in positions:
+            (stack, depth) = pos
+            if stack == move.dest and depth < move.num:
+                # this crate was one of the ones moved
+                pos[0] = move.source
+                pos[1] = move.num - 1 - depth if order.is_reversed else depth
+            elif stack == move.dest and move.dest != move.source:
+                pos[1] = depth - move.num
+            elif stack == move.source and move.dest != move.source:
+                pos[1] = depth + move.num
+    return ''.join(stacks[stack][depth] for (stack, depth) in positions)
+
+def parse(path: str) -> Tuple[list[list[str]], list[Move]]:
+    """reads the starting stacks and the moves"""
+    with open(path) as fptr:
+        (stacks, moves) = parse_stream(fptr)
+        return (stacks, list(moves))
+
+def _simulate(puzzle: Tuple[list[list[str]], list[Move]], order: InsertOrder) -> str:
+    """runs every move against a copy of the stacks, returning the tops"""
+    (stacks, moves) = puzzle
+    stacks = to_top_last(stacks)
+    for each_move in moves:
+        perform_move_top_last(each_move, stacks, order=order)
+    return tops_top_last(stacks)
+
+def part1(puzzle: Tuple[list[list[str]], list[Move]]) -> str:
+    return _simulate(puzzle, InsertOrder.Reversed)
+
+def part2(puzzle: Tuple[list[list[str]], list[Move]]) -> str:
+    return _simulate(puzzle, InsertOrder.Maintained)
+
 if __name__ == '__main__':
     with open('input.txt') as fptr:
-        lines = fptr.read().splitlines()
-    (stacks, moves) = parse_lines(lines)
-    stacks_p1 = copy.deepcopy(stacks)
-    for each_move in moves:
-        perform_move(each_move, stacks_p1)
-    top_p1 = ''.join(s[0] for s in stacks_p1)
+        (stacks, moves) = parse_stream(fptr)
+        (stacks_p1, stacks_p2) = perform_moves_both(stacks, moves)
+    top_p1 = tops_top_last(stacks_p1)
     print(f"tops of stack (part 1): {top_p1}")
-    for each_move in moves:
-        perform_move(each_move, stacks, order=InsertOrder.Maintained)
-    top_p2 = ''.join(s[0] for s in stacks)
+    top_p2 = tops_top_last(stacks_p2)
     print(f"tops of stack (part 2): {top_p2}")
\ No newline at end of file
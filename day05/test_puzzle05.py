@@ -0,0 +1,45 @@
+"""cross-checks tops_by_tracing against actually moving the crates"""
+import copy
+import random
+
+import pytest
+
+from day05.puzzle05 import InsertOrder, Move, perform_move, perform_moves_both, tops_by_tracing
+
+def random_puzzle(rng: random.Random, num_stacks: int, num_moves: int) -> tuple[list[list[str]], list[Move]]:
+    """
+    makes top-first stacks of distinct crates, and moves that never take more than the source has.
+    stacks are allowed to run empty, so the tracing has to skip them
+    """
+    crates = iter(chr(0x100 + n) for n in range(10_000))
+    stacks = [[next(crates) for _ in range(rng.randint(0, 8))] for _ in range(num_stacks)]
+    heights = [len(s) for s in stacks]
+    moves = []
+    for _ in range(num_moves):
+        source = rng.choice([idx for (idx, height) in enumerate(heights) if height])
+        dest = rng.choice([idx for idx in range(num_stacks) if idx != source])
+        num = rng.randint(1, heights[source])
+        heights[source] -= num
+        heights[dest] += num
+        moves.append(Move(num=num, source=source, dest=dest))
+    return (stacks, moves)
+
+def tops(stacks: list[list[str]], *, top_last: bool) -> str:
+    return ''.join(s[-1] if top_last else s[0] for s in stacks if s)
+
+@pytest.mark.parametrize("seed", range(50))
+def test_tracing_matches_moving(seed: int):
+    rng = random.Random(seed)
+    (stacks, moves) = random_puzzle(rng, num_stacks=rng.randint(2, 9), num_moves=rng.randint(0, 200))
+    (stacks_rev, stacks_kept) = perform_moves_both(stacks, iter(moves))
+    for (order, moved) in ((InsertOrder.Reversed, stacks_rev), (InsertOrder.Maintained, stacks_kept)):
+        one_at_a_time = copy.deepcopy(stacks)
+        for move in moves:
+            perform_move(move, one_at_a_time, order=order)
+        expected = tops(one_at_a_time, top_last=False)
+        assert tops(moved, top_last=True) == expected
+        assert tops_by_tracing(stacks, moves, order=order) == expected
+
+def test_tracing_rejects_impossible_moves():
+    with pytest.raises(ValueError):
+        tops_by_tracing([["A"], ["B", "C"]], [Move(num=2, source=0, dest=1)])
\ No newline at end of file
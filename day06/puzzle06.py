@@ -1,5 +1,17 @@
 """https://adventofcode.com/2022/day/6"""
+from argparse import ArgumentParser
+import asyncio
 from collections import deque
+import mmap
+import os
+import sys
+import timeit
+from typing import AsyncIterator, Iterable, Tuple
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional, only the mmap search needs it
+    np = None
 
 def search_unique_sequence(data: bytes, num_unique: int) -> int:
     """returns the index of the start of the datagram"""
@@ -42,11 +54,179 @@ def search_unique_sequence_2(data: bytes, num_unique: int) -> int:
         stream = ((stream << 8) | byte) & mask # cycle the byte into the stream
         
 
+class MarkerDetector:
+    """
+    finds the end of the first run of `size` unique bytes for every size, one chunk at a time.
+
+    keeps the last index each byte value was seen at, and the start of the current run of unique bytes.
+    a repeated byte just moves the start of the run past its previous occurrence, so there's no rescanning,
+    and nothing but the table has to be carried over from one chunk to the next
+    """
+    def __init__(self, sizes: Iterable[int]):
+        self.pending = sorted(set(sizes))
+        self.last_seen = [-1] * 256
+        self.run_start = 0
+        self.offset = 0 # total bytes fed so far
+    @property
+    def done(self) -> bool:
+        return not self.pending
+    def feed(self, chunk: bytes) -> list[Tuple[int, int]]:
+        """feeds the next chunk of the stream, returning (size, index) for any markers that ended in it"""
+        found = []
+        pending = self.pending
+        last_seen = self.last_seen
+        run_start = self.run_start
+        for (idx, byte) in enumerate(chunk, start=self.offset):
+            if last_seen[byte] >= run_start:
+                run_start = last_seen[byte] + 1
+            last_seen[byte] = idx
+            # the run only grows by one at a time, so sizes are found smallest first
+            while pending and idx - run_start + 1 >= pending[0]:
+                found.append((pending.pop(0), idx + 1))
+            if not pending:
+                break
+        self.run_start = run_start
+        self.offset += len(chunk)
+        return found
+
+def search_unique_sequences(data: bytes, sizes: Iterable[int]) -> dict[int, int]:
+    """returns the index of the end of the first run of `size` unique bytes, for every size, in one pass"""
+    detector = MarkerDetector(sizes)
+    found = dict(detector.feed(data))
+    if not detector.done:
+        raise ValueError(f"unique sequence of length {detector.pending[0]} not found in data")
+    return found
+
+def search_unique_sequences_mmap(path: str, sizes: Iterable[int], chunk_size: int = 1 << 18) -> dict[int, int]:
+    """same as search_unique_sequences, but memory-maps the file at `path` and scans it with numpy a chunk at a time"""
+    if np is None:
+        raise ImportError("search_unique_sequences_mmap() needs numpy installed")
+    pending = sorted(set(sizes))
+    found: dict[int, int] = {}
+    with open(path, 'rb') as fptr:
+        if os.fstat(fptr.fileno()).st_size:
+            with mmap.mmap(fptr.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                data = np.frombuffer(mapped, dtype=np.uint8)
+                try:
+                    found = _scan_chunks(data, pending, chunk_size)
+                finally:
+                    del data # the view has to go before the map can be closed
+    if pending:
+        raise ValueError(f"unique sequence of length {pending[0]} not found in data")
+    return found
+
+def _scan_chunks(data: 'np.ndarray', pending: list[int], chunk_size: int) -> dict[int, int]:
+    """
+    finds markers for the sizes in `pending` (removing them as they're found).
+
+    for every byte we work out how far back its nearest duplicate is (if it's closer than the longest size),
+    with one vectorized byte comparison per distance. a window of n bytes is unique when no byte in it has
+    a duplicate that reaches back past the window start. each chunk is scanned with the bytes just before it
+    tacked on the front, so windows spanning two chunks are seen too
+    """
+    found: dict[int, int] = {}
+    # nothing longer than 256 bytes can be unique, so those sizes stay pending
+    longest = max((n for n in pending if n <= 256), default=0)
+    if not longest:
+        return found
+    overlap = longest - 1
+    nearest = np.empty(chunk_size + overlap, dtype=np.uint8)
+    scratch = np.empty(chunk_size + overlap, dtype=np.uint8)
+    unique = np.empty(chunk_size, dtype=bool)
+    checked = np.empty(chunk_size, dtype=bool)
+    for base in range(0, len(data), chunk_size):
+        lo = max(base - overlap, 0)
+        ext = data[lo:base + chunk_size]
+        skip = base - lo
+        size = len(ext) - skip
+        # near[j] = longest - (distance back to the nearest duplicate of ext[j]), or 0 if there isn't one.
+        # closer duplicates give bigger numbers, so a running maximum over distances keeps the nearest
+        near = nearest[:len(ext)]
+        near[:] = 0
+        for dist in range(1, min(longest, len(ext))):
+            same = scratch[dist:len(ext)]
+            np.equal(ext[dist:], ext[:-dist], out=same.view(bool))
+            np.multiply(same, np.uint8(longest - dist), out=same)
+            np.maximum(near[dist:], same, out=near[dist:])
+        for num_unique in [n for n in pending if n <= longest]:
+            # the window ending at i is unique if every byte t back from the end has its duplicate
+            # more than (num_unique - 1 - t) bytes further back, or no duplicate at all
+            ok = unique[:size]
+            ok[:] = True
+            for back in range(num_unique):
+                # windows near the very start of the data would hang off the front, so they can't count
+                first = max(back - skip, 0)
+                ok[:first] = False
+                if first >= size:
+                    break
+                np.less(near[skip - back + first:len(ext) - back], longest - num_unique + 1 + back, out=checked[first:size])
+                np.logical_and(ok[first:], checked[first:size], out=ok[first:])
+            if ok.any():
+                found[num_unique] = base + int(ok.argmax()) + 1
+                pending.remove(num_unique)
+        if not any(n <= longest for n in pending):
+            break
+    return found
+
+async def stream_markers(reader: asyncio.StreamReader, sizes: Iterable[int], chunk_size: int = 64 * 1024) -> AsyncIterator[Tuple[int, int]]:
+    """yields (size, index) for each marker as soon as it shows up in the stream"""
+    detector = MarkerDetector(sizes)
+    while not detector.done and (chunk := await reader.read(chunk_size)):
+        for found in detector.feed(chunk):
+            yield found
+    if not detector.done:
+        raise ValueError(f"unique sequence of length {detector.pending[0]} not found in stream")
+
+async def _print_stdin_markers(sizes: Iterable[int]):
+    """prints markers from stdin (which has to be a pipe or socket) as they're found"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+    async for (size, idx) in stream_markers(reader, sizes):
+        print(f"{size} unique bytes end at idx = {idx}", flush=True)
+
+def benchmark(data: bytes, sizes: Iterable[int] = (4, 14), number: int = 5):
+    """prints how long each search takes to find every size in `sizes`"""
+    sizes = list(sizes)
+    searches = {
+        "search_unique_sequence": lambda: [search_unique_sequence(data, n) for n in sizes],
+        "search_unique_sequence_2": lambda: [search_unique_sequence_2(data, n) for n in sizes],
+        "search_unique_sequences": lambda: search_unique_sequences(data, sizes),
+    }
+    for (name, search) in searches.items():
+        best = min(timeit.repeat(search, number=1, repeat=number))
+        print(f"{name:>26}: {best * 1000:.3f} ms")
+
+def parse(path: str) -> bytes:
+    with open(path, 'rb') as fptr:
+        return fptr.read()
+
+def part1(data: bytes) -> int:
+    return search_unique_sequences(data, (4,))[4]
+
+def part2(data: bytes) -> int:
+    return search_unique_sequences(data, (14,))[14]
+
 if __name__ == '__main__':
-    with open('input.txt', 'rb') as fptr:
-        data: bytes = fptr.read()
-    datagram_idx = search_unique_sequence_2(data, num_unique=4)
-    print(f"start-of-packet idx = {datagram_idx}")
-    msg_idx = search_unique_sequence_2(data[datagram_idx:], num_unique=14) + datagram_idx
-    print(f"start-of-msg idx = {msg_idx}")
+    parser = ArgumentParser()
+    parser.add_argument("input", nargs="?", default="input.txt", help="input file")
+    parser.add_argument("--benchmark", action="store_true", help="time each search against the input")
+    parser.add_argument("--mmap", action="store_true", help="memory-map the input and scan it with numpy")
+    parser.add_argument("--stream", action="store_true", help="read from a pipe on stdin instead, printing markers as they're found")
+    matches = parser.parse_args()
+    if matches.stream:
+        asyncio.run(_print_stdin_markers((4, 14)))
+        sys.exit(0)
+    data = b""
+    if not matches.mmap or matches.benchmark:
+        with open(matches.input, 'rb') as fptr:
+            data = fptr.read()
+    if matches.benchmark:
+        benchmark(data)
+    if matches.mmap:
+        markers = search_unique_sequences_mmap(matches.input, (4, 14))
+    else:
+        markers = search_unique_sequences(data, (4, 14))
+    print(f"start-of-packet idx = {markers[4]}")
+    print(f"start-of-msg idx = {markers[14]}")
 
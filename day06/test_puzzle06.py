@@ -0,0 +1,55 @@
+"""checks stream_markers against search_unique_sequences over a real socket"""
+import asyncio
+import random
+import socket
+import string
+
+import pytest
+
+from advent2022.bench import generate
+from day06.puzzle06 import search_unique_sequences, stream_markers
+
+async def stream_over_socket(data: bytes, sizes: tuple[int, ...], rng: random.Random, chunk_size: int) -> dict[int, int]:
+    """writes `data` into one end of a socketpair in odd-sized chunks, collecting the markers read off the other end"""
+    (ours, theirs) = socket.socketpair()
+    (reader, reader_side) = await asyncio.open_connection(sock=ours)
+    (_, writer) = await asyncio.open_connection(sock=theirs)
+    async def send():
+        pos = 0
+        while pos < len(data):
+            step = rng.randrange(1, 4096, 2)
+            writer.write(data[pos:pos + step])
+            await writer.drain()
+            pos += step
+        writer.close()
+        await writer.wait_closed()
+    sender = asyncio.create_task(send())
+    try:
+        found = {}
+        async for (size, idx) in stream_markers(reader, sizes, chunk_size=chunk_size):
+            assert size not in found, f"{size} was yielded twice"
+            found[size] = idx
+    finally:
+        # read whatever's left so the sender can finish
+        await reader.read()
+        await sender
+        reader_side.close()
+    return found
+
+@pytest.mark.parametrize("seed", range(3))
+def test_stream_matches_search(seed: int):
+    rng = random.Random(seed)
+    # the size 4 and 6 markers turn up early on, the size 14 one only at the very end
+    data = (''.join(rng.choices("abcdef", k=500_000)) + ''.join(rng.sample(string.ascii_lowercase, 14))).encode()
+    sizes = (4, 6, 14)
+    assert asyncio.run(stream_over_socket(data, sizes, rng, chunk_size=999)) == search_unique_sequences(data, sizes)
+
+def test_stream_generated_input():
+    data = generate(6, 1 << 20).encode()
+    sizes = (4, 14)
+    found = asyncio.run(stream_over_socket(data, sizes, random.Random(1), chunk_size=4093))
+    assert found == search_unique_sequences(data, sizes)
+
+def test_stream_without_marker():
+    with pytest.raises(ValueError):
+        asyncio.run(stream_over_socket(b"abcabc" * 10_000, (4,), random.Random(2), chunk_size=333))
\ No newline at end of file
@@ -1,11 +1,13 @@
 """https://adventofcode.com/2022/day/7"""
+import bisect
 from collections import defaultdict
 from dataclasses import dataclass
 import itertools
 from enum import Enum
+import json
 from pathlib import PurePosixPath
 import re
-from typing import Any, Iterator, Iterable
+from typing import Any, Iterator, Iterable, Tuple
 
 @dataclass
 class ChangeDir:
@@ -87,20 +89,304 @@ def parse_tokens(tokens: Iterable[Token]) -> dict[str, Any]:
         dir_contents = None
     return dirs
 
+@dataclass
+class Inode:
+    """a single file or directory in a FileTable"""
+    name: str
+    parent: int # index of the parent directory, or -1 for the root
+    size: int # for directories, this is the total size of everything underneath
+    children: dict[str, int] | None = None # None for files
+
+    @property
+    def is_dir(self) -> bool:
+        return self.children is not None
+
+class FileTable:
+    """
+    a flat table of every file and directory, with parents referenced by index.
+
+    children are always added after their parent, so walking the table backwards is a post-order walk,
+    which lets us total up every directory size in one pass
+    """
+    def __init__(self):
+        self.nodes: list[Inode] = [Inode(name="/", parent=-1, size=0, children={})]
+        # normalized path parts (without the root) -> index
+        self.paths: dict[tuple[str, ...], int] = {(): 0}
+        self._keys: list[tuple[str, ...]] = [()]
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token]) -> 'FileTable':
+        """builds a table straight from tokens"""
+        table = cls()
+        cwd = 0
+        listing = False
+        for token in tokens:
+            match token:
+                case ChangeDir("/"):
+                    cwd = 0
+                    listing = False
+                case ChangeDir(".."):
+                    cwd = max(table.nodes[cwd].parent, 0)
+                    listing = False
+                case ChangeDir(to_dir):
+                    cwd = table.add(cwd, to_dir)
+                    listing = False
+                case ListDir():
+                    listing = True
+                case DirEntry(dirname):
+                    if not listing:
+                        raise ValueError(f"got a dir entry outside of ListDir: {dirname}")
+                    table.add(cwd, dirname)
+                case FileEntry(filename, size):
+                    if not listing:
+                        raise ValueError(f"got a file entry outside of ListDir: {filename}")
+                    table.add(cwd, filename, size=size)
+                case _:
+                    raise ValueError(f"unknown token `{token}`")
+        table.compute_sizes()
+        return table
+
+    @classmethod
+    def from_dict(cls, parsed: dict[str, Any]) -> 'FileTable':
+        """builds a table from the nested dictionary that parse_tokens makes"""
+        table = cls()
+        pending = [(0, parsed)]
+        while pending:
+            (parent, contents) = pending.pop()
+            for (name, entry) in contents.items():
+                if isinstance(entry, dict):
+                    pending.append((table.add(parent, name), entry))
+                else:
+                    table.add(parent, name, size=entry)
+        table.compute_sizes()
+        return table
+
+    def add(self, parent: int, name: str, *, size: int | None = None) -> int:
+        """adds a directory (or a file, if size is given) under `parent`, returning its index. existing entries are kept"""
+        siblings = self.nodes[parent].children
+        if (idx := siblings.get(name)) is not None:
+            return idx
+        idx = len(self.nodes)
+        self.nodes.append(Inode(name=name, parent=parent, size=size or 0, children={} if size is None else None))
+        siblings[name] = idx
+        key = self._keys[parent] + (name,)
+        self._keys.append(key)
+        self.paths[key] = idx
+        return idx
+
+    def path(self, idx: int) -> PurePosixPath:
+        """returns the full path of an entry"""
+        return PurePosixPath("/", *self._keys[idx])
+
+    def compute_sizes(self):
+        """totals up the size of every directory"""
+        for node in self.nodes:
+            if node.is_dir:
+                node.size = 0
+        for node in reversed(self.nodes[1:]):
+            self.nodes[node.parent].size += node.size
+
+class LogIngester:
+    """
+    builds a FileTable from a terminal log one line at a time, without tokenizing.
+
+    directory sizes are totalled as we go: each open directory on the stack keeps the size added
+    underneath it that its parent hasn't been told about yet, and hands that over when it's closed
+    with `cd ..` (or when flush() is called)
+    """
+    def __init__(self, table: FileTable | None = None, cwd: list[int] | None = None, listing: bool = False):
+        self.table = table or FileTable()
+        self.stack: list[list[int]] = [[idx, 0] for idx in (cwd or [0])] # [index, size not yet passed up]
+        self.listing = listing
+
+    @property
+    def cwd(self) -> list[int]:
+        """indexes of the open directories, from the root down"""
+        return [idx for (idx, _) in self.stack]
+
+    def feed(self, line: str):
+        """handles a single line of the log"""
+        line = line.rstrip("\r\n")
+        stack = self.stack
+        match line[:1]:
+            case "$":
+                self.listing = line.startswith("$ ls")
+                if self.listing:
+                    return
+                if not line.startswith("$ cd "):
+                    raise ValueError(f"can't handle line `{line}`")
+                to_dir = line[5:].strip()
+                if to_dir == "/":
+                    while len(stack) > 1:
+                        self._close_dir()
+                elif to_dir == "..":
+                    if len(stack) > 1:
+                        self._close_dir()
+                else:
+                    stack.append([self.table.add(stack[-1][0], to_dir), 0])
+            case "d":
+                if not self.listing:
+                    raise ValueError(f"got a dir entry outside of ListDir: {line}")
+                self.table.add(stack[-1][0], line[4:])
+            case first if first.isdigit():
+                if not self.listing:
+                    raise ValueError(f"got a file entry outside of ListDir: {line}")
+                (size, filename) = line.split(" ", 1)
+                cwd = stack[-1]
+                nodes = self.table.nodes
+                num_nodes = len(nodes)
+                self.table.add(cwd[0], filename, size=int(size))
+                if len(nodes) != num_nodes:
+                    # only count files the first time they're listed
+                    nodes[cwd[0]].size += int(size)
+                    cwd[1] += int(size)
+            case "":
+                return
+            case _:
+                raise ValueError(f"can't handle line `{line}`")
+
+    def _close_dir(self):
+        """pops the current directory off the stack, adding what was found under it to its parent"""
+        (_, added) = self.stack.pop()
+        parent = self.stack[-1]
+        self.table.nodes[parent[0]].size += added
+        parent[1] += added
+
+    def flush(self) -> FileTable:
+        """passes every pending size up to the root (leaving the directories open), returning the table"""
+        for (child, parent) in zip(reversed(self.stack[1:]), reversed(self.stack[:-1])):
+            self.table.nodes[parent[0]].size += child[1]
+            parent[1] += child[1]
+            child[1] = 0
+        return self.table
+
+def ingest_log(lines: Iterable[str]) -> FileTable:
+    """builds a FileTable from a terminal log, one line at a time"""
+    ingester = LogIngester()
+    for line in lines:
+        ingester.feed(line)
+    return ingester.flush()
+
+class SizeIndex:
+    """
+    a persistent directory size index for a log that only ever gets appended to.
+
+    remembers how far into the log it has read, so update() only has to ingest the new tail.
+    directory sizes are kept sorted (with running totals) so queries are a bisect instead of a scan.
+    an update only moves the directories whose size changed, unless so many changed that re-sorting is cheaper
+    """
+    # re-sort everything when more than 1/RESORT_FRACTION of the directories changed in one update
+    RESORT_FRACTION = 8
+
+    def __init__(self, ingester: LogIngester | None = None, offset: int = 0):
+        self.ingester = ingester or LogIngester()
+        self.offset = offset
+        self._build_sorted()
+
+    def update(self, logfile: str) -> int:
+        """reads any complete lines appended to `logfile` since the last update, returning the bytes consumed"""
+        consumed = 0
+        # sizes only ever get added to open directories, so anything that changes is on the stack at some point
+        touched = set(self.ingester.cwd)
+        with open(logfile, 'rb') as fptr:
+            fptr.seek(self.offset)
+            for line in fptr:
+                if not line.endswith(b"\n"):
+                    break # the rest of this line hasn't been written yet
+                self.ingester.feed(line.decode())
+                touched.add(self.ingester.stack[-1][0])
+                consumed += len(line)
+        if consumed:
+            self.offset += consumed
+            self._reposition(touched)
+        return consumed
+
+    def _build_sorted(self):
+        """rebuilds the sorted size index"""
+        table = self.ingester.flush()
+        self._by_size = sorted((node.size, idx) for (idx, node) in enumerate(table.nodes) if node.is_dir)
+        self._sizes = [size for (size, _) in self._by_size]
+        self._totals = list(itertools.accumulate(self._sizes, initial=0))
+        self._indexed = {idx: size for (size, idx) in self._by_size}
+        self._num_nodes = len(table.nodes)
+
+    def _reposition(self, touched: set[int]):
+        """
+        moves the directories in `touched` whose size changed (and adds any new ones) in the sorted index.
+        the running totals after the first moved entry all shift, so those are still rebuilt
+        """
+        nodes = self.ingester.flush().nodes
+        changed = [idx for idx in touched if idx < self._num_nodes and nodes[idx].size != self._indexed[idx]]
+        added = [idx for idx in range(self._num_nodes, len(nodes)) if nodes[idx].is_dir]
+        if (len(changed) + len(added)) * self.RESORT_FRACTION > len(self._by_size):
+            self._build_sorted()
+            return
+        for idx in changed:
+            pos = bisect.bisect_left(self._by_size, (self._indexed[idx], idx))
+            del self._by_size[pos]
+            del self._sizes[pos]
+        for idx in itertools.chain(changed, added):
+            entry = (nodes[idx].size, idx)
+            pos = bisect.bisect_left(self._by_size, entry)
+            self._by_size.insert(pos, entry)
+            self._sizes.insert(pos, entry[0])
+            self._indexed[idx] = entry[0]
+        self._num_nodes = len(nodes)
+        self._totals = list(itertools.accumulate(self._sizes, initial=0))
+
+    def total_of_dirs_under(self, limit: int) -> int:
+        """returns the total size of all directories smaller than `limit`"""
+        return self._totals[bisect.bisect_left(self._sizes, limit)]
+
+    def smallest_dir_over(self, needed: int) -> Tuple[PurePosixPath, int] | None:
+        """returns the smallest directory (and its size) larger than `needed`, if there is one"""
+        pos = bisect.bisect_right(self._sizes, needed)
+        if pos == len(self._by_size):
+            return None
+        (size, idx) = self._by_size[pos]
+        return (self.ingester.table.path(idx), size)
+
+    def used(self) -> int:
+        """returns the total size of everything"""
+        return self.ingester.table.nodes[0].size
+
+    def save(self, index_file: str):
+        """writes the index to disk"""
+        state = {
+            "offset": self.offset,
+            "cwd": self.ingester.cwd,
+            "listing": self.ingester.listing,
+            "nodes": [[n.name, n.parent, n.size, n.is_dir] for n in self.ingester.flush().nodes],
+        }
+        with open(index_file, 'w') as fptr:
+            json.dump(state, fptr)
+
+    @classmethod
+    def load(cls, index_file: str) -> 'SizeIndex':
+        """reads an index written by save()"""
+        with open(index_file) as fptr:
+            state = json.load(fptr)
+        table = FileTable()
+        for (name, parent, size, is_dir) in state["nodes"][1:]:
+            table.add(parent, name, size=None if is_dir else size)
+        for (node, (_, _, size, _)) in zip(table.nodes, state["nodes"]):
+            node.size = size
+        return cls(LogIngester(table, cwd=state["cwd"], listing=state["listing"]), offset=state["offset"])
+
 class CustPath:
     """yep"""
     # it's such a pain to write a subclass for Path that I'm gonna skip it
     @classmethod
-    def from_logfile(cls, logfile: str | list[str]):
+    def from_logfile(cls, logfile: str | Iterable[str]):
         if isinstance(logfile, str):
             logfile = logfile.splitlines()
-        tokens = tokenize_commands(logfile)
-        parsed = parse_tokens(tokens)['/']
-        return cls(PurePosixPath("/"), parsed)
-    def __init__(self, cwd: PurePosixPath, parsed: dict[str, Any]):
-        self._dict = parsed
+        return cls(PurePosixPath("/"), ingest_log(logfile))
+    def __init__(self, cwd: PurePosixPath, parsed: dict[str, Any] | FileTable):
+        if not isinstance(parsed, FileTable):
+            parsed = FileTable.from_dict(parsed)
+        self._table = parsed
         self._cwd = cwd
-    def _normalized(self) -> list[str]:
+    def _normalized(self) -> tuple[str, ...]:
         keys = []
         # normalize path
         for part in self._cwd.parts[1:]:
@@ -108,27 +394,24 @@ class CustPath:
                 keys.pop()
             else:
                 keys.append(part)
-        return keys
-    def _get_entry(self) -> dict[str, Any] | int:
+        return tuple(keys)
+    def _get_entry(self) -> Inode:
         """fetches the entry for this path"""
-        dirs = self._dict
-        for k in self._normalized():
-            dirs = dirs[k]
-        return dirs
+        return self._table.nodes[self._table.paths[self._normalized()]]
     def iterdir(self) -> Iterator['CustPath']:
         entry = self._get_entry()
-        return (CustPath(self._cwd / k, self._dict) for k in entry.keys())
+        return (CustPath(self._cwd / k, self._table) for k in entry.children.keys())
     def __truediv__(self, d: str) -> 'CustPath':
-        return CustPath(self._cwd / d, self._dict)
+        return CustPath(self._cwd / d, self._table)
     @property
     def parts(self) -> list[str]:
         return self._cwd.parts
     @property
     def parent(self) -> 'CustPath':
-        return CustPath(self._cwd.parent, self._dict)
+        return CustPath(self._cwd.parent, self._table)
     @property
     def parents(self) -> list['CustPath']:
-        return [CustPath(p, self._dict) for p in self._cwd.parents]
+        return [CustPath(p, self._table) for p in self._cwd.parents]
     @property
     def name(self) -> str:
         return self._cwd.name
@@ -142,15 +425,15 @@ class CustPath:
     def stem(self) -> str:
         return self._cwd.stem
     def joinpath(self, *other):
-        return CustPath(self._cwd.joinpath(*other), self._dict)
+        return CustPath(self._cwd.joinpath(*other), self._table)
     def match(self, pattern):
         return self._cwd.match(pattern)
     def with_name(self, name):
-        return CustPath(self._cwd.with_name(name), self._dict)
+        return CustPath(self._cwd.with_name(name), self._table)
     def with_stem(self, stem):
-        return CustPath(self._cwd.with_stem(stem), self._dict)
+        return CustPath(self._cwd.with_stem(stem), self._table)
     def with_suffix(self, suffix):
-        return CustPath(self._cwd.with_stem(suffix), self._dict)
+        return CustPath(self._cwd.with_stem(suffix), self._table)
     def __repr__(self) -> str:
         parts = '/'.join(self.parts[1:])
         return f"CustPath(/{parts})"
@@ -161,13 +444,11 @@ class CustPath:
         except KeyError:
             return False
     def is_file(self) -> bool:
-        return isinstance(self._get_entry(), int)
+        return not self._get_entry().is_dir
     def is_dir(self) -> bool:
-        return isinstance(self._get_entry(), dict)
+        return self._get_entry().is_dir
     def size(self) -> int:
-        if not self.is_file():
-            return sum(p.size() for p in self.iterdir())
-        return self._get_entry()
+        return self._get_entry().size
 
 def iterdir_recursive(fs: CustPath) -> list[CustPath]:
     all_paths = [fs]
@@ -178,10 +459,20 @@ def iterdir_recursive(fs: CustPath) -> list[CustPath]:
         children = list(itertools.chain.from_iterable(ch.iterdir() for ch in children))
     return all_paths
 
+def parse(path: str) -> FileTable:
+    with open(path) as fptr:
+        return ingest_log(fptr)
+
+def part1(table: FileTable) -> int:
+    return sum(node.size for node in table.nodes if node.is_dir and node.size < 100_000)
+
+def part2(table: FileTable) -> int:
+    to_free = 30_000_000 - (70_000_000 - table.nodes[0].size)
+    return min(node.size for node in table.nodes if node.is_dir and node.size > to_free)
+
 if __name__ == '__main__':
     with open('input.txt') as fptr:
-        input = fptr.read().splitlines()
-    fs = CustPath.from_logfile(input)
+        fs = CustPath.from_logfile(fptr)
     # find all directories
     all_paths = iterdir_recursive(fs)
     all_dirs = [p for p in all_paths if p.is_dir()]
@@ -0,0 +1,25 @@
+"""checks that SizeIndex keeps its sorted index right as the log grows"""
+import random
+
+import pytest
+
+from advent2022.bench import generate
+from day07.puzzle07 import SizeIndex
+
+@pytest.mark.parametrize("seed", range(5))
+def test_updates_match_a_fresh_sort(tmp_path, seed: int):
+    rng = random.Random(seed)
+    log = generate(7, 400, seed).encode()
+    logfile = tmp_path / "log.txt"
+    logfile.write_bytes(b"")
+    index = SizeIndex()
+    pos = 0
+    while pos < len(log):
+        # append in random pieces, which often end partway through a line
+        pos += rng.randint(1, 600)
+        logfile.write_bytes(log[:pos])
+        index.update(str(logfile))
+        repositioned = (index._by_size, index._sizes, index._totals)
+        index._build_sorted()
+        assert repositioned == (index._by_size, index._sizes, index._totals)
+    assert index.offset == len(log)
\ No newline at end of file
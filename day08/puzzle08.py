@@ -1,10 +1,29 @@
 """https://adventofcode.com/2022/day/8"""
+from argparse import ArgumentParser
 import itertools
-from typing import Iterator, Tuple
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+import operator
+import os
+from typing import Callable, Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional, only the *_np functions need it
+    np = None
+
+from advent2022.grid import DIGITS, DenseGrid
 
 def parse_text(text: str) -> list[list[int]]:
     return [[int(x) for x in y] for y in text.splitlines()]
 
+def load_digits(data: bytes) -> DenseGrid:
+    """loads the tree heights into a DenseGrid, one byte (0-9) per tree"""
+    grid = DenseGrid.from_bytes(data, DIGITS)
+    if grid.cells and max(grid.cells) > 9:
+        raise ValueError("grid contains something other than digits")
+    return grid
+
 def not_visible_2d(nums: list[list[int]]) -> Tuple[int, int, int]:
     """returns indexes of `nums` that are not "visible" from the outside"""
     for (colidx, col) in enumerate(nums[1:-1], start=1):
@@ -39,13 +58,242 @@ def scenic_scores(nums: list[list[int]]) -> Tuple[int, int, int]:
             down_score = trees_seen(inverted[colidx+1:])
             yield left_score * right_score * up_score * down_score
 
+def _visible_from_start(line: list[int]) -> list[bool]:
+    """returns whether each tree in `line` can be seen from the start of the line"""
+    tallest = -1
+    visible = []
+    for height in line:
+        visible.append(height > tallest)
+        tallest = max(tallest, height)
+    return visible
+
+def _distances_from_start(line: list[int]) -> list[int]:
+    """returns how many trees each tree in `line` can see looking towards the start of the line"""
+    # monotonic stack: only trees that haven't been blocked by a taller-or-equal tree stay on it
+    stack: list[int] = []
+    distances = []
+    for (idx, height) in enumerate(line):
+        while stack and line[stack[-1]] < height:
+            stack.pop()
+        distances.append(idx - stack[-1] if stack else idx)
+        stack.append(idx)
+    return distances
+
+def _both_ways(func: Callable[[list[int]], list], line: list[int], combine: Callable):
+    """runs func from both ends of `line`, combining the results per tree"""
+    forwards = func(line)
+    backwards = func(line[::-1])[::-1]
+    return [combine(f, b) for (f, b) in zip(forwards, backwards)]
+
+def _directional_map(nums: list[list[int]], func: Callable[[list[int]], list], combine: Callable) -> list[list]:
+    """applies func along every row and column (in both directions), combining the four results per tree"""
+    by_row = [_both_ways(func, row, combine) for row in nums]
+    by_col = [_both_ways(func, list(col), combine) for col in zip(*nums)]
+    return [[combine(r, by_col[x][y]) for (x, r) in enumerate(row)] for (y, row) in enumerate(by_row)]
+
+def visibility_map(nums: list[list[int]]) -> list[list[bool]]:
+    """returns whether each tree is visible from the outside, using running maxima in O(n^2)"""
+    return _directional_map(nums, _visible_from_start, operator.or_)
+
+def scenic_score_map(nums: list[list[int]]) -> list[list[int]]:
+    """returns the scenic score of every tree, using monotonic stacks in O(n^2)"""
+    return _directional_map(nums, _distances_from_start, operator.mul)
+
+def not_visible_linear(nums: list[list[int]]) -> Iterator[Tuple[Tuple[int, int], int]]:
+    """same as not_visible_2d, but linear in the number of trees"""
+    visible = visibility_map(nums)
+    for (colidx, col) in enumerate(nums[1:-1], start=1):
+        for (rowidx, value) in enumerate(col[1:-1], start=1):
+            if not visible[colidx][rowidx]:
+                yield ((colidx, rowidx), value)
+
+def scenic_scores_linear(nums: list[list[int]]) -> Iterator[int]:
+    """same as scenic_scores, but linear in the number of trees"""
+    scores = scenic_score_map(nums)
+    for row in scores[1:-1]:
+        yield from row[1:-1]
+
+def load_grid(data: bytes) -> 'np.ndarray':
+    """loads the digit file straight into a (rows, cols) uint8 array, without touching each character in python"""
+    return load_digits(data).numpy()
+
+def _digit_rows(raw: 'np.ndarray', *, width: int, stride: int, start: int, stop: int) -> 'np.ndarray':
+    """converts rows [start, stop) of a raw digit buffer into a uint8 array"""
+    # view the buffer as rows, skipping over the line endings. the last line doesn't need one
+    rows = np.lib.stride_tricks.as_strided(raw[start*stride:], shape=(stop - start, width), strides=(stride, 1))
+    grid = rows - np.uint8(ord('0'))
+    if grid.size and grid.max() > 9:
+        raise ValueError("grid contains something other than digits (or lines of different lengths)")
+    return grid
+
+def _visible_from_left_np(grid: 'np.ndarray') -> 'np.ndarray':
+    """returns whether each tree can be seen from the left edge"""
+    tallest = np.maximum.accumulate(grid.astype(np.int8), axis=1)
+    tallest_before = np.full(grid.shape, -1, dtype=np.int8)
+    tallest_before[:, 1:] = tallest[:, :-1]
+    return grid > tallest_before
+
+def _distances_from_left_np(grid: 'np.ndarray') -> 'np.ndarray':
+    """returns how many trees each tree can see looking left"""
+    cols = np.arange(grid.shape[1], dtype=np.int32)
+    blocker = np.zeros(grid.shape, dtype=np.int32)
+    closest = np.zeros(grid.shape, dtype=np.int32)
+    for height in range(10):
+        # index of the closest tree at least `height` tall, strictly to the left of each position.
+        # the edge (index 0) blocks the view too, so it's a fine default
+        np.multiply(grid[:, :-1] >= height, cols[:-1], out=blocker[:, 1:])
+        np.maximum.accumulate(blocker, axis=1, out=blocker)
+        np.copyto(closest, blocker, where=(grid == height))
+    return cols - closest
+
+def _all_directions_np(grid: 'np.ndarray', func: Callable[['np.ndarray'], 'np.ndarray']) -> list['np.ndarray']:
+    """applies a look-left function from each of the four edges"""
+    # copy the transpose so the column passes walk contiguous memory too
+    transposed = np.ascontiguousarray(grid.T)
+    return [
+        func(grid),
+        func(grid[:, ::-1])[:, ::-1],
+        func(transposed).T,
+        func(transposed[:, ::-1])[:, ::-1].T,
+    ]
+
+def visibility_np(grid: 'np.ndarray') -> 'np.ndarray':
+    """returns a boolean array of which trees are visible from the outside"""
+    (left, right, up, down) = _all_directions_np(grid, _visible_from_left_np)
+    return left | right | up | down
+
+def scenic_scores_np(grid: 'np.ndarray') -> 'np.ndarray':
+    """returns an array of the scenic score for every tree"""
+    (left, right, up, down) = _all_directions_np(grid, _distances_from_left_np)
+    return left.astype(np.int64) * right * up * down
+
+# Tiled scenic scores
+#
+# the grid is split into bands of rows, and each band is handed to a worker process. left/right
+# distances only need the band's own rows. up/down distances need to know where the closest tall
+# tree is outside the band, so each band first reports a summary of its rows (per height, per column,
+# the furthest row holding a tree at least that tall). the parent combines the summaries into a
+# "halo" for every band, and the workers finish their band with only that halo to go on.
+
+GridLayout = Tuple[int, int, int] # (height, width, stride)
+
+def _file_layout(path: str) -> GridLayout:
+    """works out the grid dimensions of a digit file without reading all of it"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as fptr:
+        first = fptr.readline()
+        fptr.seek(max(size - 2, 0))
+        tail = fptr.read()
+    width = len(first.rstrip(b"\r\n"))
+    stride = len(first) if first.endswith(b"\n") else width + 1
+    content_size = size - (len(tail) - len(tail.rstrip(b"\r\n")))
+    return (-(-content_size // stride), width, stride)
+
+def _attach_band(shm_name: str, layout: GridLayout, start: int, stop: int) -> 'np.ndarray':
+    """copies rows [start, stop) of the shared digit file into a band-sized array"""
+    (_, width, stride) = layout
+    shm = SharedMemory(name=shm_name)
+    try:
+        raw = np.frombuffer(shm.buf, dtype=np.uint8)
+        band = _digit_rows(raw, width=width, stride=stride, start=start, stop=stop)
+        del raw # the view has to go before the shared memory can be closed
+    finally:
+        shm.close()
+    return band
+
+def _furthest_rows(band: 'np.ndarray', first_row: int) -> 'np.ndarray':
+    """for each height and column, the last row in the band with a tree at least that tall (0 if none)"""
+    rows = np.arange(first_row, first_row + band.shape[0], dtype=np.int32)[:, np.newaxis]
+    return np.stack([((band >= height) * rows).max(axis=0) for height in range(10)])
+
+def _distances_from_top_np(band: 'np.ndarray', first_row: int, halo: 'np.ndarray') -> 'np.ndarray':
+    """
+    returns how many trees each tree in the band can see looking up.
+    halo[height] is the row of the closest tree at least `height` tall above the band, per column
+    """
+    rows = np.arange(first_row, first_row + band.shape[0], dtype=np.int32)[:, np.newaxis]
+    blocker = np.empty(band.shape, dtype=np.int32)
+    closest = np.zeros(band.shape, dtype=np.int32)
+    for height in range(10):
+        blocker[0] = halo[height]
+        np.multiply(band[:-1] >= height, rows[:-1], out=blocker[1:])
+        np.maximum.accumulate(blocker, axis=0, out=blocker)
+        np.copyto(closest, blocker, where=(band == height))
+    return rows - closest
+
+def _tile_summary(shm_name: str, layout: GridLayout, start: int, stop: int) -> Tuple['np.ndarray', 'np.ndarray']:
+    """returns the looking-down and looking-up boundary summaries for a band"""
+    (height, _, _) = layout
+    band = _attach_band(shm_name, layout, start, stop)
+    # rows are mirrored (row r becomes height-1-r) when looking from the bottom
+    return (_furthest_rows(band, start), _furthest_rows(band[::-1], height - stop))
+
+def _tile_best_score(shm_name: str, layout: GridLayout, start: int, stop: int,
+                     halo_above: 'np.ndarray', halo_below: 'np.ndarray') -> int:
+    """returns the best scenic score within a band"""
+    (height, _, _) = layout
+    band = _attach_band(shm_name, layout, start, stop)
+    left = _distances_from_left_np(band)
+    right = _distances_from_left_np(band[:, ::-1])[:, ::-1]
+    up = _distances_from_top_np(band, start, halo_above)
+    down = _distances_from_top_np(band[::-1], height - stop, halo_below)[::-1]
+    return int((left.astype(np.int64) * right * up * down).max())
+
+def best_scenic_score_tiled(path: str, *, processes: int | None = None, band_rows: int | None = None) -> int:
+    """
+    returns the best scenic score of the forest in `path`, splitting the rows into bands
+    that are scored in a pool of worker processes. each worker only holds its own band in memory
+    """
+    layout = _file_layout(path)
+    (height, width, _) = layout
+    if not height or not width:
+        raise ValueError(f"{path} has no trees in it")
+    processes = processes or os.cpu_count() or 1
+    band_rows = band_rows or -(-height // processes)
+    bands = [(start, min(start + band_rows, height)) for start in range(0, height, band_rows)]
+    shm = SharedMemory(create=True, size=max(os.path.getsize(path), 1))
+    try:
+        with open(path, 'rb') as fptr:
+            fptr.readinto(shm.buf)
+        with multiprocessing.Pool(processes) as pool:
+            summaries = pool.starmap(_tile_summary, [(shm.name, layout, start, stop) for (start, stop) in bands])
+            # fold the summaries into halos: everything above a band, and everything below it
+            no_trees = np.zeros((10, width), dtype=np.int32)
+            above = list(itertools.accumulate((down for (down, _) in summaries[:-1]), np.maximum, initial=no_trees))
+            below = list(itertools.accumulate((up for (_, up) in summaries[:0:-1]), np.maximum, initial=no_trees))[::-1]
+            scores = pool.starmap(_tile_best_score, [
+                (shm.name, layout, start, stop, halo_above, halo_below)
+                for ((start, stop), halo_above, halo_below) in zip(bands, above, below)
+            ])
+    finally:
+        shm.close()
+        shm.unlink()
+    return max(scores)
+
+def parse(path: str) -> DenseGrid:
+    with open(path, 'rb') as fptr:
+        return load_digits(fptr.read())
+
+def _row_bytes(grid: DenseGrid) -> list[bytes]:
+    # indexing bytes is quicker than indexing the memoryview rows, and the linear functions index a lot
+    return [row.tobytes() for row in grid.rows()]
+
+def part1(grid: DenseGrid) -> int:
+    return grid.width * grid.height - sum(1 for _ in not_visible_linear(_row_bytes(grid)))
+
+def part2(grid: DenseGrid) -> int:
+    return max(scenic_scores_linear(_row_bytes(grid)))
+
 if __name__ == '__main__':
-    with open('input.txt') as fptr:
-        nums: list[list[int]] = parse_text(fptr.read())
-    invisible_trees = list(not_visible_2d(nums))
+    parser = ArgumentParser()
+    parser.add_argument("input", nargs="?", default="input.txt", help="input file")
+    matches = parser.parse_args()
+    grid = parse(matches.input)
+    nums = _row_bytes(grid)
+    invisible_trees = list(not_visible_linear(nums))
     print(f"invisible trees: {len(invisible_trees)}")
-    total_trees = len(nums) * len(nums[0])
+    total_trees = grid.width * grid.height
     visible_trees = total_trees - len(invisible_trees)
     print(f"visible trees: {visible_trees}")
-    max_scenic = max(scenic_scores(nums))
+    max_scenic = max(scenic_scores_linear(nums))
     print(f"best scenic score = {max_scenic}")
@@ -0,0 +1,68 @@
+"""checks the linear, numpy and tiled tree scans against the original brute force ones"""
+import random
+
+import pytest
+
+from day08.puzzle08 import (best_scenic_score_tiled, load_digits, load_grid, not_visible_2d, not_visible_linear,
+                            parse_text, scenic_scores, scenic_scores_linear, scenic_scores_np, visibility_np)
+
+SAMPLE = "30373\n25512\n65332\n33549\n35390\n"
+
+def random_forest(seed: int) -> str:
+    """a non-square forest, with a narrow range of heights now and then so there are plenty of ties"""
+    rng = random.Random(seed)
+    (height, width) = (rng.randint(3, 25), rng.randint(3, 25))
+    digits = rng.choice(["0123456789", "456", "09"])
+    return ''.join(''.join(rng.choices(digits, k=width)) + '\n' for _ in range(height))
+
+FORESTS = [SAMPLE] + [random_forest(seed) for seed in range(40)]
+
+def test_sample():
+    nums = parse_text(SAMPLE)
+    assert 25 - len(list(not_visible_linear(nums))) == 21
+    assert max(scenic_scores_linear(nums)) == 8
+
+@pytest.mark.parametrize("text", FORESTS)
+def test_linear_matches_original(text: str):
+    nums = parse_text(text)
+    assert list(not_visible_linear(nums)) == list(not_visible_2d(nums))
+    assert list(scenic_scores_linear(nums)) == list(scenic_scores(nums))
+
+@pytest.mark.parametrize("text", FORESTS)
+def test_numpy_matches_original(text: str):
+    pytest.importorskip("numpy")
+    nums = parse_text(text)
+    grid = load_grid(text.encode())
+    hidden = [((int(y), int(x)), nums[y][x]) for (y, x) in zip(*(~visibility_np(grid)).nonzero())]
+    assert sorted(hidden) == sorted(not_visible_2d(nums))
+    assert scenic_scores_np(grid)[1:-1, 1:-1].ravel().tolist() == list(scenic_scores(nums))
+
+@pytest.mark.parametrize("text", FORESTS[:10])
+@pytest.mark.parametrize("band_rows", [1, 2, 7])
+def test_tiled_matches_original(tmp_path, text: str, band_rows: int):
+    pytest.importorskip("numpy")
+    path = tmp_path / "input.txt"
+    path.write_bytes(text.encode())
+    best = max(scenic_scores(parse_text(text)))
+    assert best_scenic_score_tiled(str(path), processes=2, band_rows=band_rows) == best
+
+def test_digits_only():
+    with pytest.raises(ValueError):
+        load_digits(b"123\n4a6\n789\n")
+
+@pytest.mark.parametrize("trailing", ["\r\n", ""])
+def test_tiled_crlf(tmp_path, trailing: str):
+    pytest.importorskip("numpy")
+    text = FORESTS[1]
+    path = tmp_path / "input.txt"
+    path.write_bytes(text.rstrip("\n").replace("\n", "\r\n").encode() + trailing.encode())
+    best = max(scenic_scores(parse_text(text)))
+    assert best_scenic_score_tiled(str(path), processes=2, band_rows=3) == best
+
+@pytest.mark.parametrize("data", [b"", b"\n", b"\r\n"])
+def test_tiled_empty(tmp_path, data: bytes):
+    pytest.importorskip("numpy")
+    path = tmp_path / "input.txt"
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match="no trees"):
+        best_scenic_score_tiled(str(path), processes=2)
\ No newline at end of file
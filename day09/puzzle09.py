@@ -25,11 +25,13 @@
 # (note: part 2 has more possible positions, but is the same idea)
 
 from argparse import ArgumentParser
-from dataclasses import dataclass
 from enum import Enum
 import logging
 from typing import Iterable, Iterator, Tuple
 
+from advent2022 import profiling
+from advent2022.geometry import Point
+
 def parse_movelist(lines: list[str]) -> Iterator[Tuple['Move', int]]:
     """parses a list of lines into a list of moves"""
     for line in lines:
@@ -45,15 +47,6 @@ def parse_movelist(lines: list[str]) -> Iterator[Tuple['Move', int]]:
             case err:
                 raise ValueError(f"failed to parse input {err}")
 
-@dataclass(eq=True, frozen=True)
-class Point:
-    x: int
-    y: int
-    def __add__(self, other: 'Point') -> 'Point':
-        return Point(self.x + other.x, self.y + other.y)
-    def __sub__(self, other: 'Point') -> 'Point':
-        return Point(self.x - other.x, self.y - other.y)
-
 def simulate_moves(movelist: Iterable[Tuple['Move', int]], rope_length: int) -> set[Point]:
     """simulates the moves from a movelist for a rope of length `rope_length`, returning the points visited"""
     rope = [Point(0, 0) for _ in range(rope_length)]
@@ -63,18 +56,48 @@ def simulate_moves(movelist: Iterable[Tuple['Move', int]], rope_length: int) ->
         visited.add(rope[-1])
     return visited
 
+@profiling.profiled()
+def simulate_rope_lengths(movelist: Iterable[Tuple['Move', int]], rope_lengths: Iterable[int]) -> dict[int, int]:
+    """
+    simulates the longest rope once, returning the number of points visited by the tail of each rope length
+
+    knot k follows the same path no matter how many knots come after it, so a rope of length N
+    is just the first N knots of a longer rope
+    """
+    lengths = set(rope_lengths)
+    if not lengths or min(lengths) < 1:
+        raise ValueError(f"rope lengths must be at least 1, got {sorted(lengths)}")
+    rope = [Point(0, 0) for _ in range(max(lengths))]
+    visited: dict[int, set[Point]] = {length: {rope[length-1]} for length in lengths}
+    for (move, times) in movelist:
+        (x, y) = move.value
+        profiling.count("rope.head_steps", times)
+        for _ in range(times):
+            rope[0] = rope[0].offset(x, y)
+            for idx in range(1, len(rope)):
+                tail = move_tail(head=rope[idx-1], tail=rope[idx])
+                if tail == rope[idx]:
+                    # this knot didn't move, so nothing behind it will either
+                    break
+                rope[idx] = tail
+            for (length, points) in visited.items():
+                points.add(rope[length-1])
+    return {length: len(points) for (length, points) in visited.items()}
+
 class Move(Enum):
     Up = (0, 1)
     Down = (0, -1)
     Left = (-1, 0)
     Right = (1, 0)
+    @profiling.profiled()
     def apply(self, rope: list[Point], *, times: int = 1, visited: set[Point] = None) -> list[Point]:
         """apply a movement to the head and tail, returning (head, tail)"""
         (x, y) = self.value
+        profiling.count("rope.head_steps", times)
         # print(f"\n{self} {times} times")
         for _ in range(times):
             (head, *rest) = rope
-            head = Point(x=head.x + x, y=head.y+y)
+            head = head.offset(x, y)
             new_rope = [head]
             for tail in rest:
                 tail = move_tail(head=head, tail=tail)
@@ -127,13 +150,21 @@ def print_field(rope: list[Point]):
         print(''.join(row))
     print()
 
+def parse(path: str) -> list[Tuple[Move, int]]:
+    with open(path) as fptr:
+        return list(parse_movelist(fptr))
+
+def part1(moves: list[Tuple[Move, int]]) -> int:
+    return simulate_rope_lengths(moves, rope_lengths=(2,))[2]
+
+def part2(moves: list[Tuple[Move, int]]) -> int:
+    return simulate_rope_lengths(moves, rope_lengths=(10,))[10]
+
 if __name__ == '__main__':
     parser = ArgumentParser()
     parser.add_argument('input', help='input file')
     matches = parser.parse_args()
     with open(matches.input) as fptr:
-        moves = list(parse_movelist(fptr))
-        visited_r2 = simulate_moves(moves, rope_length=2)
-        print(f"visited (rope length=2) = {len(visited_r2)}")
-        visited_r10 = simulate_moves(moves, rope_length=10)
-        print(f"visited (rope length=10 = {len(visited_r10)}")
\ No newline at end of file
+        visited = simulate_rope_lengths(parse_movelist(fptr), rope_lengths=(2, 10))
+        print(f"visited (rope length=2) = {visited[2]}")
+        print(f"visited (rope length=10) = {visited[10]}")
\ No newline at end of file
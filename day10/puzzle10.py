@@ -66,6 +66,17 @@ def render_screen(instructions: Iterable[Instruction]) -> list[str]:
     ]
     return screen
 
+def parse(path: str) -> list[Instruction]:
+    with open(path) as fptr:
+        return list(decode_instructions(fptr))
+
+def part1(instructions: list[Instruction]) -> int:
+    cycles = {20, 60, 100, 140, 180, 220}
+    return sum(pc * x for (pc, (_, x)) in enumerate(execute(instructions), start=1) if pc in cycles)
+
+def part2(instructions: list[Instruction]) -> str:
+    return '\n'.join(render_screen(instructions))
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("input", help="input file to read")
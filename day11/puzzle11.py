@@ -1,5 +1,6 @@
 """https://adventofcode.com/2022/day/11"""
 import argparse
+import copy
 from dataclasses import dataclass
 from enum import Enum
 from functools import reduce
@@ -7,6 +8,8 @@ import operator
 import re
 from typing import Callable, Iterable, Iterator, Tuple
 
+from advent2022 import profiling
+
 def parse_monkeys(text: Iterable[str]) -> Iterator['Monkey']:
     """Parses input text into monkeys"""
     current_monkey = {}
@@ -66,9 +69,11 @@ class Monkey:
     true_throw_to: int
     false_throw_to: int
     inspected: int = 0
+    @profiling.profiled()
     def run_test(self, *, all_monkeys: list['Monkey']) -> Tuple[int, int]:
         """returns the monkey to throw the item to, and the item"""
         self.inspected += 1
+        profiling.count("monkey.items_inspected")
         next_item_worry = self.items.pop(0)
         new_worry = self.operation(next_item_worry)
         div_worry = find_new_worry(all_monkeys, new_worry)
@@ -84,22 +89,34 @@ def find_new_worry(monkeys: Iterable[Monkey], worry: int) -> int:
     value = reduce(operator.mul, divs)
     return worry % value
 
+def run_rounds(monkeys: list[Monkey], rounds: int):
+    """has the monkeys throw everything around for a number of rounds"""
+    for _ in range(rounds):
+        for monkey in monkeys:
+            while monkey.items:
+                (thrown_to, worry) = monkey.run_test(all_monkeys=monkeys)
+                monkeys[thrown_to].items.append(worry)
+
+def parse(path: str) -> list[Monkey]:
+    """reads the monkeys from the notes. they get mutated, so each part works on its own copy"""
+    with open(path) as fptr:
+        return list(parse_monkeys(fptr))
+
+# part 1 (dividing worry by 3) was never written, this only solves part 2
+
+def part2(monkeys: list[Monkey]) -> int:
+    monkeys = copy.deepcopy(monkeys)
+    run_rounds(monkeys, 10000)
+    (most_active, next_most) = sorted((m.inspected for m in monkeys), reverse=True)[:2]
+    return most_active * next_most
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("input", help="file to read from")
     matches = parser.parse_args()
     with open(matches.input) as fptr:
         monkeys = list(parse_monkeys(fptr))
-    for round in range(1, 10001):
-        # print(f"Round {round}")
-        for monkey in monkeys:
-            while monkey.items:
-                (thrown_to, worry) = monkey.run_test(all_monkeys=monkeys)
-                # print(f"thows to {thrown_to} with worry {worry}")
-                monkeys[thrown_to].items.append(worry)
-        # print(f"after round {round}, monkeys are holding items with these worry levels:")
-        # for (idx, monkey) in enumerate(monkeys):
-        #     print(f"monkey {idx}: holding {monkey.items}, inspected {monkey.inspected} items")
+    run_rounds(monkeys, 10000)
     by_activity = sorted(monkeys, key=lambda m: m.inspected, reverse=True)
     (most_active, next_most) = (by_activity[0], by_activity[1])
     print(f"monkey business = {most_active.inspected} * {next_most.inspected} = {most_active.inspected * next_most.inspected}")
\ No newline at end of file
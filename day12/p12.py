@@ -1,42 +1,33 @@
 """https://adventofcode.com/2022/day/12"""
 import argparse
 from collections import defaultdict
-from dataclasses import dataclass
 import io
 import math
 from typing import Callable, Iterator, Tuple
 
+from advent2022 import profiling
+from advent2022.geometry import Point
+from advent2022.grid import DenseGrid
+
 class NoSolutionError(ValueError):
     """raises if there is no solution to (start, end)"""
 
-@dataclass(frozen=True)
-class Point:
-    x: int
-    y: int
-    def __add__(self, other):
-        return Point(self.x + other.x, self.y + other.y)
-    def __sub__(self, other):
-        return Point(self.x - other.x, self.y - other.y)
-
-def parse_levels(text: list[str]) -> Tuple[list[list[int]], Point, Point]:
-    """parses the input text into a list of list of levels. returns the Start and End locations too"""
-    levels: list[list[int]] = []
-    start = None
-    end = None
-    for (y, line) in enumerate(text):
-        levels.append([])
-        for (x, ch) in enumerate(line):
-            if ch == 'S':
-                start = Point(x, y)
-                ch = 'a'
-            elif ch == 'E':
-                end = Point(x, y)
-                ch = 'z'
-            elif ch == '\n':
-                raise ValueError("newline detected in input")
-            levels[-1].append(calc_weight(ch))
-    assert start is not None, "no start found!"
-    assert end is not None, "no end found!"
+# a-z are levels 0-25, S sits at level a and E at level z
+_LEVELS = bytes.maketrans(b"SEabcdefghijklmnopqrstuvwxyz", bytes([0, 25, *range(26)]))
+
+def parse_levels(text: list[str]) -> Tuple[DenseGrid, Point, Point]:
+    """parses the input text into a grid of levels. returns the Start and End locations too"""
+    return load_levels('\n'.join(text).encode())
+
+def load_levels(data: bytes) -> Tuple[DenseGrid, Point, Point]:
+    """like parse_levels, but straight from the bytes of the input file"""
+    levels = DenseGrid.from_bytes(data)
+    assert ord('S') in levels.cells, "no start found!"
+    assert ord('E') in levels.cells, "no end found!"
+    (start, end) = (levels.find(ord('S')), levels.find(ord('E')))
+    levels.cells = levels.cells.translate(_LEVELS)
+    if levels.cells and max(levels.cells) > 25:
+        raise ValueError("heightmap contains something other than a-z, S and E")
     return (levels, start, end)
 
 def calc_weight(ch: str) -> int:
@@ -45,30 +36,25 @@ def calc_weight(ch: str) -> int:
 
 class Grid:
     """defines a grid with weights"""
-    def __init__(self, weights: list[list[int]], *, start: Point, end: Point):
+    def __init__(self, weights: DenseGrid, *, start: Point, end: Point):
         self.start = start
         self.end = end
         self.weights = weights
     def find_all(self, pred: Callable[[Point], bool]) -> Iterator[Point]:
         """returns all nodes where pred(node) returns True"""
-        for y in range(len(self.weights)):
-            for x in range(len(self.weights[0])):
+        for y in range(self.weights.height):
+            for x in range(self.weights.width):
                 p = Point(x, y)
                 if pred(p):
                     yield p
     def neighbors(self, node: Point) -> Iterator[Point]:
         """returns a list of neighbors to `node`"""
-        if node.x > 0:
-            yield Point(node.x - 1, node.y)
-        if node.y > 0:
-            yield Point(node.x, node.y - 1)
-        if node.x < len(self.weights[0]) - 1:
-            yield Point(node.x + 1, node.y)
-        if node.y < len(self.weights) - 1:
-            yield Point(node.x, node.y + 1)
+        return self.weights.neighbors(node)
     def weight(self, node: Point) -> float:
         """returns the weight for a node"""
-        return self.weights[node.y][node.x]
+        # nodes only come from neighbors() and find_all(), so they're in bounds already
+        (x, y) = node
+        return self.weights.cells[y * self.weights.width + x]
     def distance(self, start: Point, end: Point) -> int:
         """returns the distance function between two points"""
         start_weight = self.weight(start)
@@ -80,6 +66,7 @@ class Grid:
         """returns the heuristic for a point"""
         return math.sqrt((node.y - self.end.y)**2 + (node.x - self.end.x)**2)
 
+@profiling.profiled()
 def a_star(start: Point, goal: Point, grid: Grid):
     """
     perform an A* search from start to goal
@@ -100,6 +87,7 @@ def a_star(start: Point, goal: Point, grid: Grid):
         # TODO: can/should we use heapq for this?
         open_set.sort(key=lambda p: f_score.get(p, float('inf')))
         current = open_set.pop(0)
+        profiling.count("a_star.pops")
         if current == goal:
             return (reconstruct_path(came_from, current), came_from)
         for each_neighbor in grid.neighbors(current):
@@ -116,8 +104,8 @@ def a_star(start: Point, goal: Point, grid: Grid):
 def render_came_from(came_from: dict[Point, Point], good_path: list[Point], grid: Grid) -> str:
     """renders the dictionary describing predecessors"""
     buffer = io.StringIO()
-    for y in range(len(grid.weights)):
-        for x in range(len(grid.weights[0])):
+    for y in range(grid.weights.height):
+        for x in range(grid.weights.width):
             p = Point(x, y)
             if p == grid.start:
                 buffer.write("S")
@@ -151,6 +139,29 @@ def reconstruct_path(came_from: dict[Point, Point], current: Point) -> list[Poin
         current = preceding
     return total_path
 
+def parse(path: str) -> Tuple[DenseGrid, Point, Point]:
+    with open(path, 'rb') as fptr:
+        return load_levels(fptr.read())
+
+def part1(levels: Tuple[DenseGrid, Point, Point]) -> int:
+    (weights, start, end) = levels
+    grid = Grid(weights, start=start, end=end)
+    (path, _) = a_star(grid.start, grid.end, grid)
+    return len(path) - 1
+
+def part2(levels: Tuple[DenseGrid, Point, Point]) -> int:
+    (weights, start, end) = levels
+    grid = Grid(weights, start=start, end=end)
+    shortest_path = float('inf')
+    for each_start in list(weights.find_all(0)):
+        grid.start = each_start
+        try:
+            (path, _) = a_star(grid.start, grid.end, grid)
+        except NoSolutionError:
+            continue
+        shortest_path = min(shortest_path, len(path) - 1)
+    return shortest_path
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("input", help="file input")
@@ -97,6 +97,19 @@ def is_ordered(left_packet: list[list | int], right_packet: list[list | int]) ->
             case (l, r):
                 raise AssertionError("we shouldn't be here")
 
+def parse(path: str) -> list[Tuple[list[list | int], list[list | int]]]:
+    with open(path) as fptr:
+        return list(parse_input(fptr.read().splitlines()))
+
+def part1(packets_tup: list[Tuple[list[list | int], list[list | int]]]) -> int:
+    return sum(i for (i, (l, r)) in enumerate(packets_tup, start=1) if is_ordered(l, r))
+
+def part2(packets_tup: list[Tuple[list[list | int], list[list | int]]]) -> int:
+    packets: list[list[list | int]] = list(itertools.chain.from_iterable(packets_tup))
+    packets.extend([[[2]], [[6]]])
+    packets.sort(key=cmp_to_key(lambda l, r: -1 if is_ordered(l, r) else 1))
+    return (packets.index([[2]]) + 1) * (packets.index([[6]]) + 1)
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("input", help="input file to pull from")
@@ -1,30 +1,18 @@
 """https://adventofcode.com/2022/day/14"""
 
 import argparse
-from dataclasses import dataclass
 from enum import Enum
 import itertools
-from typing import Iterator, Optional, Self, Tuple
-
-@dataclass
-class Point:
-    x: int
-    y: int
-    @classmethod
-    def parse(cls, text: str) -> Self:
-        """parses text such as `498,4` into a Point class"""
-        x, y = text.strip().split(',')
-        return cls(x=int(x), y=int(y))
-    @classmethod
-    def line(cls, start: Self, end: Self) -> list[Self]:
-        """creates a line of `Point`s from start to end"""
-        if start.x == end.x:
-            (ystart, yend) = sorted([start.y, end.y])
-            return [Point(start.x, y) for y in range(ystart, yend+1)]
-        if start.y == end.y:
-            (xstart, xend) = sorted([start.x, end.x])
-            return [Point(x, start.y) for x in range(xstart, xend+1)]
-        raise ValueError(f"cannot construct line from {start} to {end}: only straight lines supported")
+from typing import Iterator, Optional, Tuple
+
+from advent2022 import profiling
+from advent2022.geometry import Point, segment
+from advent2022.grid import DenseGrid
+
+def parse_point(text: str) -> Point:
+    """parses text such as `498,4` into a Point"""
+    x, y = text.strip().split(',')
+    return Point(x=int(x), y=int(y))
 
 class GridElem(Enum):
     Empty = '.'
@@ -33,70 +21,78 @@ class GridElem(Enum):
     def is_empty(self) -> bool:
         return self == self.Empty
 
+# the same, as they're stored in the grid
+(EMPTY, ROCK, SAND) = (ord(GridElem.Empty.value), ord(GridElem.Rock.value), ord(GridElem.Sand.value))
+
+# where the sand pours in from
+SAND_SOURCE = Point(500, 0)
+
 class Grid:
-    def __init__(self):
-        self.grid = [[]]
+    """
+    the cave, as a DenseGrid of GridElem characters. it's sized up front to fit any pile of
+    sand that can form above the floor (sand only spreads one column per row it falls),
+    so it never has to grow. column 0 of the DenseGrid is x == self.x0
+    """
+    def __init__(self, rocks: list[Point]):
+        # the lowest rock. sand that falls past it is in the void (unless there's a floor)
+        self.bottom = max((y for (_, y) in rocks), default=0)
+        self.floor_y: Optional[int] = None
+        height = self.bottom + 3 # leaves room for the floor, 2 below the lowest rock
+        self.x0 = min(min((x for (x, _) in rocks), default=SAND_SOURCE.x), SAND_SOURCE.x - height)
+        x1 = max(max((x for (x, _) in rocks), default=SAND_SOURCE.x), SAND_SOURCE.x + height)
+        self.cells = DenseGrid(x1 - self.x0 + 1, height, fill=EMPTY)
         self.minx = 0xffffffff
         self.miny = 0xffffffff
-        self.floor_y = None
+        for rock in rocks:
+            self.insert(rock, GridElem.Rock)
     def _make_floor(self):
-        """normalizes the unbounded floor at our new dimensions"""
-        if not self.floor_y:
-            self.floor_y = len(self.grid) + 2
-        if self.floor_y >= len(self.grid):
-            self._extend_y(self.floor_y)
-        self.grid[self.floor_y-1] = [GridElem.Rock] * len(self.grid[-1])
-    def _extend_y(self, new_ymax: int):
-        """extends the grid Y-axis dimension"""
-        extend_by = new_ymax - len(self.grid) + 1
-        for _ in range(extend_by):
-            self.grid.append([GridElem.Empty] * len(self.grid[0]))
-    def _extend_x(self, new_xmax: int):
-        """extends the grid X-axis dimension"""
-        extend_by = new_xmax - len(self.grid[0]) + 1
-        for row in self.grid:
-            row.extend([GridElem.Empty] * extend_by)
+        """puts the floor in, two below the lowest rock"""
+        self.floor_y = self.bottom + 2
+        self.cells.row(self.floor_y)[:] = bytes([ROCK]) * self.cells.width
+    def index(self, coord: Point) -> int:
+        """index of a cave coordinate in self.cells.cells"""
+        (x, y) = coord
+        return self.cells.index(Point(x - self.x0, y))
+    def point(self, index: int) -> Point:
+        """cave coordinate of an index into self.cells.cells"""
+        (x, y) = self.cells.point(index)
+        return Point(x + self.x0, y)
+    @property
+    def void_index(self) -> int:
+        """sand at or past this index has fallen into the void"""
         if self.floor_y:
-            self._make_floor()
+            return len(self.cells.cells) # the floor catches everything
+        return (self.bottom + 1) * self.cells.width
     def insert(self, coord: Point, elem: GridElem):
         """inserts an element into the grid"""
         self.minx = min(self.minx, coord.x)
         self.miny = min(self.miny, coord.y)
-        if coord.y >= len(self.grid):
-            self._extend_y(coord.y)
-        if coord.x >= len(self.grid[0]):
-            self._extend_x(coord.x)
-        self.grid[coord.y][coord.x] = elem
+        self.cells.cells[self.index(coord)] = ord(elem.value)
     def value(self, coord: Point) -> GridElem:
         """returns value at coord"""
-        if coord.y >= len(self.grid):
-            if not self.floor_y:
-                return GridElem.Empty # special case: we're in the endless void
-            self._make_floor()
-        try:
-            return self.grid[coord.y][coord.x]
-        except IndexError:
-            if self.floor_y:
-                # extend the grid to cover this
-                self._extend_x(max(coord.x, len(self.grid[-1])) + 20)
-                return self.grid[coord.y][coord.x]
-            # we don't care about this IndexError though
-            return GridElem.Empty
+        if self.fell_into_the_void(coord):
+            return GridElem.Empty # special case: we're in the endless void
+        return GridElem(chr(self.cells.cells[self.index(coord)]))
     def fell_into_the_void(self, coord: Point) -> bool:
         """returns True if the sand is below the level of rock"""
-        return coord.y >= len(self.grid)
+        return not self.floor_y and coord[1] > self.bottom
+    def render(self) -> str:
+        """the cave as text, from the leftmost thing in it"""
+        return '\n'.join(row[self.minx - self.x0:].tobytes().decode() for row in self.cells.rows())
 
-def parse_lines(text: Iterator[str]) -> Grid:
-    """parses the text into a grid"""
-    grid = Grid()
+def parse_rocks(text: Iterator[str]) -> list[Point]:
+    """parses the text into every point that's rock"""
+    rocks: list[Point] = []
     for textline in text:
-        points = [Point.parse(p) for p in textline.split('->')]
+        points = [parse_point(p) for p in textline.split('->')]
         point_pairs = itertools.pairwise(points)
         for (start, end) in point_pairs:
-            pointline = Point.line(start, end)
-            for each in pointline:
-                grid.insert(each, GridElem.Rock)
-    return grid
+            rocks.extend(segment(start, end))
+    return rocks
+
+def parse_lines(text: Iterator[str]) -> Grid:
+    """parses the text into a grid"""
+    return Grid(parse_rocks(text))
 
 class EndlessVoidIndexError(IndexError):
     """marks the endless void below the lowest rock"""
@@ -107,47 +103,62 @@ class SandFellIntoTheEndlessVoidError(Exception):
 class EmitSandError(Exception):
     """cannot emit sand from the hole"""
 
+@profiling.profiled()
 def drop_sand(grid: Grid) -> Point:
     """drop a piece of sand, returning where it ends. raises SandFellIntoTheEndlessVoid if sand falls into the endless void"""
-    sand = Point(500, 0)
-    if grid.value(sand) == GridElem.Sand:
+    # the sand moves through flat indexes into the grid: one row down is + width
+    cells = grid.cells.cells
+    width = grid.cells.width
+    void = grid.void_index
+    sand = grid.index(SAND_SOURCE)
+    profiling.count("sand.grains_dropped")
+    if cells[sand] == SAND:
         raise EmitSandError("cannot emit a grain of sand")
     while True:
-        if grid.fell_into_the_void(sand):
-            raise SandFellIntoTheEndlessVoidError(f"point {sand} belongs to the void")
-        below = Point(sand.x, sand.y+1)
-        downleft = Point(sand.x-1, sand.y+1)
-        downright = Point(sand.x+1, sand.y+1)
-        if grid.value(below).is_empty():
+        if sand >= void:
+            raise SandFellIntoTheEndlessVoidError(f"point {grid.point(sand)} belongs to the void")
+        below = sand + width
+        if cells[below] == EMPTY:
             sand = below # sand can fall down. we continue letting the sand fall
             continue
-        if grid.value(downleft).is_empty():
-            sand = downleft # sand can fall down and to the left. we continue letting the sand fall
+        if cells[below-1] == EMPTY:
+            sand = below - 1 # sand can fall down and to the left. we continue letting the sand fall
             continue
-        if grid.value(downright).is_empty():
-            sand = downright # sand can fall down and to the right. we continue letting the sand fall
+        if cells[below+1] == EMPTY:
+            sand = below + 1 # sand can fall down and to the right. we continue letting the sand fall
             continue
         # sand can't go down anymore. it has settled.
-        grid.insert(sand, GridElem.Sand)
-        break
+        resting = grid.point(sand)
+        grid.insert(resting, GridElem.Sand)
+        return resting
+
+def pour_sand(grid: Grid, max_iterations: int = 1000) -> int:
+    """drops sand until it falls into the void or clogs the hole, returning how many grains came to rest"""
+    for times in range(1, max_iterations+1):
+        try:
+            drop_sand(grid)
+        except (SandFellIntoTheEndlessVoidError, EmitSandError):
+            return times - 1
+    raise AssertionError("dropped a bunch of sand and none of it fell into the void :( the void hungers :(")
 
 def solve(grid: Grid, max_iterations: int = 1000):
-    for row in grid.grid:
-        print(''.join(x.value for x in row[grid.minx:]))
+    print(grid.render())
     print()
-    try:
-        for times in range(1, max_iterations+1):
-            drop_sand(grid)
-    except SandFellIntoTheEndlessVoidError:
-        # rad, it worked!
-        print(f"{times-1} grains of sand fell into the void")
-    except EmitSandError:
-        # it worked even better!
-        print(f"{times-1} grains of sand fell until the top was clogged")
-    else:
-        raise AssertionError("dropped a bunch of sand and none of it fell into the void :( the void hungers :(")
-    for row in grid.grid:
-        print(''.join(x.value for x in row[grid.minx:]))
+    print(f"{pour_sand(grid, max_iterations)} grains of sand came to rest")
+    print(grid.render())
+
+def parse(path: str) -> list[Point]:
+    """reads the rocks. the grid fills up with sand, so each part builds its own"""
+    with open(path) as fptr:
+        return parse_rocks(fptr)
+
+def part1(rocks: list[Point]) -> int:
+    return pour_sand(Grid(rocks), max_iterations=100000)
+
+def part2(rocks: list[Point]) -> int:
+    grid = Grid(rocks)
+    grid._make_floor()
+    return pour_sand(grid, max_iterations=100000)
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
@@ -1,38 +1,23 @@
 """https://adventofcode.com/2022/day/15"""
 
 import argparse
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import itertools
 import re
 from typing import Callable, Iterable, Iterator, Self
 
-INPUT_RE = re.compile(r"Sensor at x=(?P<sx>[-0-9]+), y=(?P<sy>[-0-9]+): closest beacon is at x=(?P<bx>[-0-9]+), y=(?P<by>[-0-9]+)")
+from advent2022.geometry import Point, manhattan, segment
 
-@dataclass(frozen=True)
-class Point:
-    x: int
-    y: int
-    def __post_init__(self):
-        assert isinstance(self.x, int)
-        assert isinstance(self.y, int)
-    def __add__(self, other: Self) -> Self:
-        return Point(self.x + other.x, self.y + other.y)
-    @classmethod
-    def manhattan_distance(cls, p1: Self, p2: Self) -> int:
-        """returns the manhattan distance between two points"""
-        return abs(p2.y - p1.y) + abs(p2.x - p1.x)
-    @classmethod
-    def range_inclusive(cls, start: Self, end: Self) -> Iterator[Self]:
-        if start.x == end.x:
-            return (Point(start.x, y) for y in range(start.y, end.y+1))
-        if start.y == end.y:
-            return (Point(x, start.y) for x in range(start.x, end.x+1))
-        raise ValueError(f"both xs or both ys must be equal")
+INPUT_RE = re.compile(r"Sensor at x=(?P<sx>[-0-9]+), y=(?P<sy>[-0-9]+): closest beacon is at x=(?P<bx>[-0-9]+), y=(?P<by>[-0-9]+)")
 
 @dataclass
 class Sensor:
     location: Point
     closest_beacon: Point
+    # distance to the closest beacon. everything this close or closer is covered
+    radius: int = field(init=False)
+    def __post_init__(self):
+        self.radius = manhattan(self.location, self.closest_beacon)
     @classmethod
     def parse(cls, text: str) -> Self:
         """parses a line of input into a Sensor descriptor"""
@@ -44,9 +29,7 @@ class Sensor:
         raise ValueError(f"failed to parse text {text}")
     def closer_than_beacon(self, poi: Point) -> bool:
         """returns True if a point of interest is closer than this sensor's beacon"""
-        beacon_dist: int = Point.manhattan_distance(self.location, self.closest_beacon)
-        point_dist: int = Point.manhattan_distance(self.location, poi)
-        return point_dist <= beacon_dist
+        return manhattan(self.location, poi) <= self.radius
 
 def parse_input(lines: Iterable[str]) -> Iterator[Sensor]:
     """parses the input into an iterator of sensors"""
@@ -66,34 +49,34 @@ def around(point: Point, distance: int) -> Iterator[Point]:
     """returns an iterator of points `distance` away from `point`"""
     for x in range(0, distance+1):
         y = distance - x
-        yield point + Point(x, y)
+        yield point.offset(x, y)
         if y:
-            yield point + Point(x, -y)
+            yield point.offset(x, -y)
         if x:
-            yield point + Point(-x, y)
+            yield point.offset(-x, y)
         if x and y:
-            yield point + Point(-x, -y)
+            yield point.offset(-x, -y)
 
 def solve1(sensors: list[Sensor], y_val: int = 2000000):
     """finds all points covered by beacons at a specific y-value"""
-    max_dist = max(Point.manhattan_distance(s.location, s.closest_beacon) for s in sensors)
+    max_dist = max(s.radius for s in sensors)
     min_x = apply_x(sensors, min) - max_dist
     max_x = apply_x(sensors, max) + max_dist
     print(f"min/max = {min_x}, {max_x}")
-    prange = list(Point.range_inclusive(Point(min_x, y_val), Point(max_x, y_val)))
+    prange = segment(Point(min_x, y_val), Point(max_x, y_val))
     beacons = set(prange) & {s.closest_beacon for s in sensors}
     coverage = [(p, list(point_covered_by(p, sensors))) for p in prange]
     covered_by_beacons = [p for (p, cov) in coverage if cov and p not in beacons]
     # print(f"covered({len(covered_by_beacons)}): {covered_by_beacons}")
     c = len(covered_by_beacons)
     print(f"covered by beacons: {c}")
+    return c
 
 def solve2(sensors: list[Sensor], dim: int = 20):
     """finds the only point not covered by a beacon in an area of [0, dim] by [0, dim]"""
     for each in sensors:
         print(f"sensor: {each}")
-        beacon_distance = Point.manhattan_distance(each.location, each.closest_beacon)
-        for point in around(each.location, beacon_distance + 1):
+        for point in around(each.location, each.radius + 1):
             if point.x < 0 or point.x > dim or point.y < 0 or point.y > dim:
                 # point is outside the dimensions we're searching
                 continue
@@ -108,9 +91,19 @@ def solve2(sensors: list[Sensor], dim: int = 20):
                 print(f"found uncovered point at {point}")
                 tuning_freq = point.x * 4000000 + point.y
                 print(f"tuning frequency: {tuning_freq}")
-                return
+                return tuning_freq
     raise ValueError("no point found")
 
+def parse(path: str) -> list[Sensor]:
+    with open(path) as fptr:
+        return list(parse_input(fptr.read().splitlines()))
+
+def part1(sensors: list[Sensor]) -> int:
+    return solve1(sensors)
+
+def part2(sensors: list[Sensor]) -> int:
+    return solve2(sensors, dim=4000000)
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("input", help="input file")
@@ -201,6 +201,15 @@ def pressure(path: list[TreeNode]) -> int:
                 total += valve.rate * (29 - idx)
     return total
 
+def parse(path: str) -> ValveDict:
+    with open(path) as fptr:
+        return {v.ident: v for v in parse_input(fptr.read().splitlines())}
+
+# only part 1 is solved (and only approximately)
+
+def part1(valves: ValveDict) -> int:
+    return pressure(solve1(valves)[:30])
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("input", help="input file")